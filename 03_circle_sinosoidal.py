@@ -1,16 +1,25 @@
 from operator import itemgetter
 from enum import Enum
 import numpy as np
-from ipywidgets import Box, interactive_output, Layout, ToggleButtons, VBox
-from IPython.display import display
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib.animation as animation
+from utils import lifecycle
 from utils.state import State
+from utils.streaming import RingBuffer, SocketSignalSource, min_max_decimate
+from utils.reactive import DependencyGraph
+from utils.pyramid import SamplePyramid
+from utils.cache import ByteLRUCache
+from utils.animation.clip_recorder import ClipRecorder
+from utils.animation.frame_producer import FrameProducer
+from utils.animation.idle import IdleThrottle
+from utils.animation.lod import LevelOfDetail
+from utils.animation.multiplexer import AnimationMultiplexer
+from utils.animation.prefetcher import Prefetcher
 from utils.ui.constants import UIContainerProp
-from utils.ui.slider import SliderProp, define_slider
+from utils.ui.coalescer import UpdateCoalescer
 from utils.maths.trigonometry import TWO_PI, period, wave
 
+# Widgets, pyplot and the ipycanvas backends are imported where they're used,
+# so the calculate_* helpers import without them.
+
 NOTEBOOK_FILE_NAME = '03_circle_sinosoidal'
 FOUR_PI = TWO_PI * 2 # A value we use in a number of places.
 MIN_X = TWO_PI * -1
@@ -33,6 +42,9 @@ class StateProp(Enum):
 
 # UI
 SLIDER_DECIMAL_PRECISION = 2
+# Update while a slider is dragged, not just on release. Events are coalesced
+# so state changes at most once per animation frame.
+SLIDER_CONTINUOUS_UPDATE = False
 
 class ToggleButtonOption(Enum):
     SINE = 'Sine'
@@ -46,6 +58,96 @@ ANIMATION_INTERVAL = 50
 ANIMATION_SAVE_COUNT = 1500
 ANIMATION_STEP_FACTOR = 25
 ANIMATION_FRAME_STEP_FACTOR = 0.1
+ANIMATION_PRECOMPUTE_FRAMES = False # Calculate frames on a background thread.
+ANIMATION_PRECOMPUTE_QUEUE_SIZE = 20
+# Drive frames from an asyncio task on the kernel's event loop instead of a
+# matplotlib timer, so slider updates can interrupt a slow frame.
+ANIMATION_ASYNCIO_DRIVER = False
+SLIDER_DRAG_SETTLE_TIME = ANIMATION_INTERVAL * 2 / 1000 # In seconds.
+
+# Keep the last few seconds of frames so they can be saved as a clip.
+CLIP_RECORDING = False
+CLIP_SECONDS = 10
+CLIP_FRAMES = CLIP_SECONDS * 1000 // ANIMATION_INTERVAL
+CLIP_FILE_EXTENSION = 'gif' # Or 'mp4', which needs ffmpeg.
+
+# Cache wave geometry per set of state values, and precompute it for the
+# values next to a slider's current one while the animation runs.
+GEOMETRY_PREFETCH = False
+GEOMETRY_CACHE_BYTES = 64 * 1024 * 1024
+GEOMETRY_CACHE_X_PRECISION = 6
+GEOMETRY_CACHE_PROPS = [
+    StateProp.TRIG_FUNCTION,
+    StateProp.PHASE_SHIFT,
+    StateProp.VERTICAL_SHIFT,
+    StateProp.HORIZONTAL_SCALAR,
+    StateProp.VERTICAL_SCALAR,
+]
+
+# Keep the pixels of each frame drawn, keyed on the state and x. Until the
+# state changes, the animation goes back and forth over the same frames, so
+# they're copied back rather than recalculated and redrawn.
+FRAME_CACHE = False
+FRAME_CACHE_BYTES = 128 * 1024 * 1024
+
+# Slow the animation down when nobody has touched the controls for a while,
+# then pause it. Any interaction brings it straight back.
+IDLE_THROTTLING = False
+IDLE_THROTTLE_AFTER = 15 # In seconds.
+IDLE_PAUSE_AFTER = 120 # In seconds, or None to never pause.
+IDLE_THROTTLED_INTERVAL = ANIMATION_INTERVAL * 5
+
+# Lower the level of detail while frames take longer than the interval, and
+# raise it again when there's time to spare. Level 0 is full detail.
+ANIMATION_LOD = False
+LOD_WINDOW = 10 # Frames.
+LOD_LEVELS = [
+    {'samples': 1, 'theta_circle': True, 'antialiased': True},
+    {'samples': 0.5, 'theta_circle': True, 'antialiased': True},
+    {'samples': 0.25, 'theta_circle': False, 'antialiased': True},
+    {'samples': 0.25, 'theta_circle': False, 'antialiased': False},
+]
+
+# Plot a live, noisy signal over the model wave, so its parameters can be
+# matched by eye. Samples sweep across the axes like an oscilloscope trace.
+LIVE_SIGNAL = False
+LIVE_SIGNAL_RATE = 20000 # Samples per second.
+LIVE_SIGNAL_SWEEP_SECONDS = 2
+LIVE_SIGNAL_NOISE = 0.05
+LIVE_SIGNAL_SEED = 3
+LIVE_SIGNAL_WAVE = {
+    StateProp.TRIG_FUNCTION: 'Sine',
+    StateProp.PHASE_SHIFT: 0.5,
+    StateProp.VERTICAL_SHIFT: 0.25,
+    StateProp.HORIZONTAL_SCALAR: 1.5,
+    StateProp.VERTICAL_SCALAR: 1.25,
+}
+
+# Zoom the wave with the scroll wheel and pan it by dragging, over a domain
+# of thousands of periods. The full wave is read from a pyramid of samples
+# at the resolution that matches the view.
+ZOOM_AND_PAN = False
+ZOOM_DOMAIN_PERIODS = 2000 # Either side of the origin, at a frequency of 1.
+ZOOM_SAMPLES_PER_PERIOD = 32
+ZOOM_FACTOR = 1.25 # Per step of the scroll wheel.
+ZOOM_MIN_WIDTH = TWO_PI / 4
+
+# Show several figures, each with its own controls, driven from one timer.
+DASHBOARD_FIGURES = 1
+DASHBOARD_TICK_BUDGET = ANIMATION_INTERVAL * 0.8 / 1000 # In seconds.
+
+class AnimationBackend(Enum):
+    MATPLOTLIB = 'matplotlib'
+    CANVAS = 'canvas' # Vector draw commands via ipycanvas.
+    REGIONS = 'regions' # Agg, sending only the changed pixels via ipycanvas.
+
+ANIMATION_BACKEND = AnimationBackend.MATPLOTLIB
+
+# For the regions backend. A lower scale renders fewer pixels, which the
+# browser scales up; JPEG is smaller than PNG but lossy.
+TRANSPORT_SCALE = 1.0
+TRANSPORT_FORMAT = 'png' # Or 'jpeg'.
+TRANSPORT_QUALITY = 75 # JPEG only, from 1 to 95.
 
 class PlotPart(Enum):
     PLT = 'plt'
@@ -62,10 +164,30 @@ class AnimatedPart(Enum):
     TERMINAL_ARM = 'terminal_arm'
     CONNECTING_ARM = 'connecting_arm'
 
+# Values calculated from the state, each recalculated only when something it
+# depends on changes.
+class DerivedValue(Enum):
+    WAVE_FUNCTIONS = 'wave_functions'
+    FULL_WAVE = 'full_wave'
+    TITLE = 'title'
+    PERIOD_WAVE = 'period_wave'
+    CIRCLE = 'circle'
+    THETA_CIRCLE = 'theta_circle'
+    ARMS = 'arms'
+
 class FrameField(Enum):
     I = 'i'
+    STEP = 'step' # x in steps of ANIMATION_FRAME_STEP_FACTOR.
     X = 'x'
     CHANGED = 'changed'
+    STATE = 'state'
+    PARTS = 'parts'
+    TITLE = 'title'
+    DETAIL = 'detail' # The level of detail, an index into LOD_LEVELS.
+
+class ZoomPart(Enum):
+    VIEW = 'view' # Returns the full wave's samples for the current limits.
+    APPLY = 'apply' # Applies the limits scrolling and dragging have set.
 
 
 # Display
@@ -76,20 +198,45 @@ class Color(Enum):
     LIGHT_GRAY = '#888888'
     BLUE = '#1b9ce5'
     LIGHT_BLUE = '#36a8e8'
+    ORANGE = '#e5641b'
 
 class LineWidth(Enum):
     THIN = 0.5
     THICK = 4.0
 
-def update_state(state):
+def define_initial_state():
+    state = State()
+    state.define({
+        StateProp.MODIFIED: False,
+        StateProp.TRIG_FUNCTION: ToggleButtonOption.SINE,
+        StateProp.PHASE_SHIFT: 0,
+        StateProp.VERTICAL_SHIFT: 0,
+        StateProp.HORIZONTAL_SCALAR: 1,
+        StateProp.VERTICAL_SCALAR: 1,
+    })
+    return state
+
+def update_state(state, coalescer=None):
     def fn(trig_function, phase_shift, vertical_shift, horizontal_scalar, vertical_scalar):
-        state.set_multiple({
+        updates = {
             StateProp.TRIG_FUNCTION: trig_function,
             StateProp.PHASE_SHIFT: phase_shift,
             StateProp.VERTICAL_SHIFT: vertical_shift,
             StateProp.HORIZONTAL_SCALAR: horizontal_scalar,
             StateProp.VERTICAL_SCALAR: vertical_scalar,
-        })
+        }
+        # When coalescing, the frame generator applies the updates. A click
+        # on the toggle buttons isn't part of a drag, so it's applied now,
+        # along with anything waiting, for the next frame to restart from.
+        # The state starts out with the enum member, while the toggle buttons
+        # pass its value, so both are compared as members.
+        toggled = ToggleButtonOption(trig_function) != ToggleButtonOption(state.get(StateProp.TRIG_FUNCTION))
+        if coalescer is not None and not toggled:
+            coalescer.push(updates)
+        elif coalescer is not None:
+            state.set_multiple(coalescer.flush() | updates)
+        else:
+            state.set_multiple(updates)
     return fn
 
 def define_wave_functions(values):
@@ -106,7 +253,7 @@ def define_wave_functions(values):
     cosine_wave = wave(np.cos)
 
     # Formulate the equation that we'll use for this frame and the current state.
-    if trig_function == ToggleButtonOption.COSINE:
+    if ToggleButtonOption(trig_function) == ToggleButtonOption.COSINE:
         fnc = cosine_wave
     else:
         fnc = sine_wave
@@ -124,8 +271,8 @@ def define_wave_functions(values):
         'wave_equation': wave_equation
     }
 
-def calculate_range_steps(scaled_x):
-    return abs(int(scaled_x* ANIMATION_STEP_FACTOR))
+def calculate_range_steps(scaled_x, sample_factor=1):
+    return abs(int(scaled_x* ANIMATION_STEP_FACTOR * sample_factor))
 
 def calculate_full_wave_data(values):
     wave_equation, horizontal_scalar, vertical_scalar  = itemgetter(
@@ -135,7 +282,7 @@ def calculate_full_wave_data(values):
     )(values)
 
     max_full_range_adjusted = MAX_FULL_RANGE if horizontal_scalar < 1 else MAX_FULL_RANGE * horizontal_scalar
-    steps =  calculate_range_steps(max_full_range_adjusted * vertical_scalar)
+    steps =  calculate_range_steps(max_full_range_adjusted * vertical_scalar, values.get('sample_factor', 1))
     range = np.linspace(MIN_FULL_RANGE, max_full_range_adjusted, steps)
     ys = wave_equation(range)
 
@@ -144,17 +291,20 @@ def calculate_full_wave_data(values):
         'ys': ys,
     }
 
+def calculate_period_x(values):
+    step_x, phase_shift = itemgetter('step_x', StateProp.PHASE_SHIFT)(values)
+    return phase_shift + step_x
+
 def calculate_period_wave_data(values):
-    wave_equation, step_x, phase_shift, vertical_scalar  = itemgetter(
+    wave_equation, phase_shift, vertical_scalar  = itemgetter(
         'wave_equation',
-        'step_x',
         StateProp.PHASE_SHIFT,
         StateProp.VERTICAL_SCALAR,
     )(values)
 
     start = phase_shift
-    x = start + step_x
-    steps =  calculate_range_steps(x * vertical_scalar)
+    x = calculate_period_x(values)
+    steps =  calculate_range_steps(x * vertical_scalar, values.get('sample_factor', 1))
     range = np.linspace(start, x, steps)
     ys = wave_equation(range)
     y = 0 if np.size(ys) == 0 else ys[-1]
@@ -194,6 +344,8 @@ def calculate_terminal_arm_data(values):
     }
 
 def define_toggle_buttons():
+    from ipywidgets import Box, Layout, ToggleButtons
+
     toggle_buttons = ToggleButtons(options=[
         ToggleButtonOption.SINE.value,
         ToggleButtonOption.COSINE.value,
@@ -209,6 +361,9 @@ def define_toggle_buttons():
     }
 
 def define_sliders(default_values):
+    from ipywidgets import Layout, VBox
+    from utils.ui.slider import SliderProp, define_slider
+
     phase_shift, vertical_shift, horizontal_scalar, vertical_scalar  = itemgetter(
         StateProp.PHASE_SHIFT,
         StateProp.VERTICAL_SHIFT,
@@ -250,7 +405,12 @@ def define_sliders(default_values):
     sliders = {}
     layout_children = []
     for k, v in slider_specs.items():
-        definition = define_slider(v, key=k, label_precision=SLIDER_DECIMAL_PRECISION)
+        definition = define_slider(
+            v,
+            key=k,
+            label_precision=SLIDER_DECIMAL_PRECISION,
+            continuous_update=SLIDER_CONTINUOUS_UPDATE,
+        )
         sliders[k] = definition[UIContainerProp.CONTROLS][k]
         layout_children.append(definition[UIContainerProp.CONTAINER])
 
@@ -266,7 +426,9 @@ def define_sliders(default_values):
         ),
     }
 
-def define_ui(state):
+def define_ui(state, coalescer=None, prefetcher=None, on_interaction=None):
+    from ipywidgets import Box, interactive_output, Layout
+
     phase_shift = state.get(StateProp.PHASE_SHIFT)
     vertical_shift = state.get(StateProp.VERTICAL_SHIFT)
     horizontal_scalar = state.get(StateProp.HORIZONTAL_SCALAR)
@@ -285,15 +447,26 @@ def define_ui(state):
     for k, v in (toggle_buttons[UIContainerProp.CONTROLS] | sliders[UIContainerProp.CONTROLS]).items():
         controls[k.value] = v
 
-    interactive_output(
-        update_state(state),
+    output = interactive_output(
+        update_state(state, coalescer),
         controls,
     )
 
+    # Work out the geometry for the values either side of a slider's new
+    # value, since that's most likely where it'll go next.
+    if prefetcher is not None:
+        for k, v in sliders[UIContainerProp.CONTROLS].items():
+            v.observe(prefetch_neighbours(state, prefetcher, k, v), names='value')
+
+    if on_interaction is not None:
+        for v in controls.values():
+            v.observe(lambda _: on_interaction(), names='value')
+
     return Box(
         children=[
             toggle_buttons[UIContainerProp.CONTAINER],
             sliders[UIContainerProp.CONTAINER],
+            output,
         ],
         layout=Layout(
             display='flex',
@@ -303,6 +476,8 @@ def define_ui(state):
     )
 
 def define_plot(plt):
+    import matplotlib.patches as patches
+
     fig, ax = plt.subplots()
 
     # Set visual qualities of the figure itself.
@@ -402,7 +577,7 @@ def define_plot(plt):
         }
     }
 
-def update_title(values):
+def format_title(values):
     trig_function, vertical_scalar, horizontal_scalar, phase_shift, vertical_shift = itemgetter(
         StateProp.TRIG_FUNCTION,
         StateProp.VERTICAL_SCALAR,
@@ -411,12 +586,14 @@ def update_title(values):
         StateProp.VERTICAL_SHIFT,
     )(values)
 
-    ax = plt.gca()
-    function = "cos" if trig_function == ToggleButtonOption.COSINE.value else "sin"
+    function = "cos" if ToggleButtonOption(trig_function) == ToggleButtonOption.COSINE else "sin"
     equation = f"{vertical_scalar:.2f} × {function}({horizontal_scalar:.2f} × (x - {phase_shift:.2f})) + {vertical_shift:.2f}"
     period = f"T = 2π/{horizontal_scalar:.2f}"
-    ax.set_title(
-        f"{equation}; {period}",
+    return f"{equation}; {period}"
+
+def update_title(element, title):
+    element.set_title(
+        title,
         fontdict={'color': Color.LIGHT_GRAY.value, 'size': 10},
         pad=15,
     )
@@ -462,21 +639,44 @@ def update_connecting_arm(element, values):
     y2 = values['y2']
     element.set_data([x1, x2], [y1, y2])
 
-def generate_frames(state):
+def generate_frames(state, coalescer=None):
     def fn():
         i = 0
-        x = 0
+        # x is counted in whole steps, so the same step gives exactly the same
+        # x on the way back as on the way out, which adding to x wouldn't.
+        step = 0
         direction = 1
         changed = False
+        pushed = False # Whether the last frame applied slider events.
+        dragging = False
         while True:
             yield {
                 FrameField.I: i,
-                FrameField.X: x,
+                FrameField.STEP: step,
+                FrameField.X: step * ANIMATION_FRAME_STEP_FACTOR,
                 FrameField.CHANGED: changed
             }
 
+            # Apply any slider events received since the last frame in one go.
+            updates = {}
+            if coalescer is not None:
+                updates = coalescer.flush()
+                if updates:
+                    state.set_multiple(updates)
+
+            # Events on consecutive frames are a drag. Restarting the period on
+            # every step of one would keep the wave pinned at the origin, so it
+            # carries on from x, and restarts once the drag has settled.
+            if updates and pushed:
+                dragging = True
+            elif dragging and not updates and not coalescer.is_active():
+                dragging = False
+                step = 0
+            pushed = bool(updates)
+
             if state.has_changed():
-                x = 0
+                if not dragging:
+                    step = 0
                 changed = True
                 state.acknowledge()
             else:
@@ -485,20 +685,427 @@ def generate_frames(state):
             frequency = state.get(StateProp.HORIZONTAL_SCALAR)
             period_length = period()(frequency)
 
-            if x <= 0:
+            if step <= 0:
                 direction = 1
-            elif x >= period_length:
+            elif step * ANIMATION_FRAME_STEP_FACTOR >= period_length:
                 direction = -1
 
-            x += direction * ANIMATION_FRAME_STEP_FACTOR
+            step += direction
             i += 1
     return fn
 
 
-def animate(animated_parts, state):
+def calculate_full_wave(current_state, wave_equation=None):
+    if wave_equation is None:
+        wave_equation = define_wave_functions(current_state)['wave_equation']
+    return calculate_full_wave_data({
+        'wave_equation': wave_equation,
+        StateProp.HORIZONTAL_SCALAR:
+            current_state[StateProp.HORIZONTAL_SCALAR],
+        StateProp.VERTICAL_SCALAR:
+            current_state[StateProp.VERTICAL_SCALAR],
+    })
+
+def calculate_circle_data(values):
+    period_x, vertical_shift, vertical_scalar = itemgetter(
+        'period_x',
+        StateProp.VERTICAL_SHIFT,
+        StateProp.VERTICAL_SCALAR,
+    )(values)
+
+    return {
+        'x': period_x,
+        'y': vertical_shift,
+        'radius': vertical_scalar,
+    }
+
+def calculate_theta_circle_data(values):
+    period_range, origin_x, origin_y = itemgetter(
+        'period_range',
+        'origin_x',
+        'origin_y',
+    )(values)
+
+    return {
+        'x': origin_x + (np.cos(period_range) * THETA_CIRCLE_FACTOR),
+        'y': origin_y + (np.sin(period_range) * THETA_CIRCLE_FACTOR),
+    }
+
+def assemble_parts(full_wave_data, period_wave_data, circle_data, theta_circle_data, arm_data):
+    return {
+        AnimatedPart.FULL_WAVE: {
+            'range': full_wave_data['range'],
+            'ys': full_wave_data['ys'],
+        },
+        AnimatedPart.PERIOD_WAVE: {
+            'range': period_wave_data['range'],
+            'ys': period_wave_data['ys'],
+        },
+        AnimatedPart.POINT: {
+            'x': period_wave_data['x'],
+            'y': period_wave_data['y'],
+        },
+        AnimatedPart.CIRCLE: circle_data,
+        AnimatedPart.THETA_CIRCLE: theta_circle_data,
+        AnimatedPart.TERMINAL_ARM: {
+            'x1': arm_data['x1'],
+            'x2': arm_data['x2'],
+            'y1': arm_data['y1'],
+            'y2': arm_data['y2'],
+        },
+        AnimatedPart.CONNECTING_ARM: {
+            'x1': arm_data['x2'],
+            'x2': period_wave_data['x'],
+            'y1': arm_data['y2'],
+            'y2': period_wave_data['y'],
+        },
+    }
+
+def calculate_parts(current_state, x, full_wave_data=None):
+    sine_wave, cosine_wave, wave_equation = itemgetter(
+        'sine_wave',
+        'cosine_wave',
+        'wave_equation',
+    )(define_wave_functions(current_state))
+
+    if full_wave_data is None:
+        full_wave_data = calculate_full_wave(current_state, wave_equation)
+
+    period_wave_data = calculate_period_wave_data({
+        'wave_equation': wave_equation,
+        'step_x': x,
+        StateProp.PHASE_SHIFT: current_state[StateProp.PHASE_SHIFT],
+        StateProp.VERTICAL_SCALAR: current_state[StateProp.VERTICAL_SCALAR],
+    })
+
+    circle_data = calculate_circle_data({
+        'period_x': period_wave_data['x'],
+        StateProp.VERTICAL_SHIFT: current_state[StateProp.VERTICAL_SHIFT],
+        StateProp.VERTICAL_SCALAR: current_state[StateProp.VERTICAL_SCALAR],
+    })
+    theta_circle_data = calculate_theta_circle_data({
+        'period_range': period_wave_data['range'],
+        'origin_x': circle_data['x'],
+        'origin_y': circle_data['y'],
+    })
+
+    arm_data = calculate_terminal_arm_data({
+        'cosine_wave': cosine_wave,
+        'sine_wave': sine_wave,
+        'period_x': period_wave_data['x'],
+        StateProp.VERTICAL_SCALAR: current_state[StateProp.VERTICAL_SCALAR],
+        StateProp.HORIZONTAL_SCALAR: current_state[StateProp.HORIZONTAL_SCALAR],
+        'origin_x': circle_data['x'],
+        'origin_y': circle_data['y'],
+        'theta_x': theta_circle_data['x'],
+        'theta_y': theta_circle_data['y'],
+    })
+
+    return assemble_parts(full_wave_data, period_wave_data, circle_data, theta_circle_data, arm_data)
+
+
+def define_dependency_graph():
+    # Each derived value names the state properties (and other derived
+    # values) it's calculated from, so a change only recalculates what uses
+    # it. Frame x counts as an input, since it changes every frame.
+    wave_props = [
+        StateProp.TRIG_FUNCTION,
+        StateProp.PHASE_SHIFT,
+        StateProp.VERTICAL_SHIFT,
+        StateProp.HORIZONTAL_SCALAR,
+        StateProp.VERTICAL_SCALAR,
+    ]
+
+    graph = DependencyGraph()
+    graph.node(
+        DerivedValue.WAVE_FUNCTIONS,
+        define_wave_functions,
+        wave_props,
+    )
+    graph.node(
+        DerivedValue.TITLE,
+        format_title,
+        wave_props,
+    )
+    graph.node(
+        DerivedValue.FULL_WAVE,
+        lambda values: calculate_full_wave_data(values | {
+            'wave_equation': values[DerivedValue.WAVE_FUNCTIONS]['wave_equation'],
+            'sample_factor': LOD_LEVELS[values[FrameField.DETAIL]]['samples'],
+        }),
+        [DerivedValue.WAVE_FUNCTIONS, FrameField.DETAIL, StateProp.HORIZONTAL_SCALAR, StateProp.VERTICAL_SCALAR],
+    )
+    graph.node(
+        DerivedValue.PERIOD_WAVE,
+        lambda values: calculate_period_wave_data(values | {
+            'wave_equation': values[DerivedValue.WAVE_FUNCTIONS]['wave_equation'],
+            'step_x': values[FrameField.X],
+            'sample_factor': LOD_LEVELS[values[FrameField.DETAIL]]['samples'],
+        }),
+        [DerivedValue.WAVE_FUNCTIONS, FrameField.X, FrameField.DETAIL, StateProp.PHASE_SHIFT, StateProp.VERTICAL_SCALAR],
+    )
+    graph.node(
+        DerivedValue.CIRCLE,
+        # The circle is worked out from the step rather than the period wave,
+        # so changing the trig function doesn't recalculate it.
+        lambda values: calculate_circle_data(values | {
+            'period_x': calculate_period_x(values | {'step_x': values[FrameField.X]}),
+        }),
+        [FrameField.X, StateProp.PHASE_SHIFT, StateProp.VERTICAL_SHIFT, StateProp.VERTICAL_SCALAR],
+    )
+    graph.node(
+        DerivedValue.THETA_CIRCLE,
+        lambda values: calculate_theta_circle_data({
+            'period_range': values[DerivedValue.PERIOD_WAVE]['range'],
+            'origin_x': values[DerivedValue.CIRCLE]['x'],
+            'origin_y': values[DerivedValue.CIRCLE]['y'],
+        }),
+        [DerivedValue.PERIOD_WAVE, DerivedValue.CIRCLE],
+    )
+    def calculate_arm_data(values):
+        # The arms start from the end of the theta circle, which is worked out
+        # on its own, so levels of detail without the circle don't calculate it.
+        theta_end = calculate_theta_circle_data({
+            'period_range': values[DerivedValue.PERIOD_WAVE]['range'][-1:],
+            'origin_x': values[DerivedValue.CIRCLE]['x'],
+            'origin_y': values[DerivedValue.CIRCLE]['y'],
+        })
+        return calculate_terminal_arm_data(values | {
+            'cosine_wave': values[DerivedValue.WAVE_FUNCTIONS]['cosine_wave'],
+            'sine_wave': values[DerivedValue.WAVE_FUNCTIONS]['sine_wave'],
+            'period_x': values[DerivedValue.PERIOD_WAVE]['x'],
+            'origin_x': values[DerivedValue.CIRCLE]['x'],
+            'origin_y': values[DerivedValue.CIRCLE]['y'],
+            'theta_x': theta_end['x'],
+            'theta_y': theta_end['y'],
+        })
+
+    graph.node(
+        DerivedValue.ARMS,
+        calculate_arm_data,
+        [
+            DerivedValue.WAVE_FUNCTIONS,
+            DerivedValue.PERIOD_WAVE,
+            DerivedValue.CIRCLE,
+            StateProp.VERTICAL_SCALAR,
+            StateProp.HORIZONTAL_SCALAR,
+        ],
+    )
+    return graph
+
+
+def set_graph_inputs(graph, current_state, x, detail=0):
+    graph.set_inputs(current_state | {
+        FrameField.X: x,
+        FrameField.DETAIL: detail,
+    })
+
+def calculate_graph_parts(graph, current_state, x, detail=0):
+    set_graph_inputs(graph, current_state, x, detail)
+    return assemble_parts(
+        graph.get(DerivedValue.FULL_WAVE),
+        graph.get(DerivedValue.PERIOD_WAVE),
+        graph.get(DerivedValue.CIRCLE),
+        graph.get(DerivedValue.THETA_CIRCLE) if LOD_LEVELS[detail]['theta_circle'] else None,
+        graph.get(DerivedValue.ARMS),
+    )
+
+
+def geometry_cache_key(values):
+    # Slider values carry floating point noise, e.g. 0.35000000000000003.
+    key = [ToggleButtonOption(values[StateProp.TRIG_FUNCTION]).value]
+    for prop in GEOMETRY_CACHE_PROPS[1:]:
+        key.append(round(values[prop], SLIDER_DECIMAL_PRECISION))
+    return tuple(key)
+
+
+def calculate_cycle_geometry(key):
+    # The full wave, plus the parts for every frame of the first pass through
+    # the period, as generate_frames steps through it after a change.
+    current_state = dict(zip(GEOMETRY_CACHE_PROPS, key))
+    full_wave_data = calculate_full_wave(current_state)
+    period_length = period()(current_state[StateProp.HORIZONTAL_SCALAR])
+    cycle = {}
+    x = 0
+    while x <= period_length:
+        cycle[round(x, GEOMETRY_CACHE_X_PRECISION)] = calculate_parts(current_state, x, full_wave_data)
+        x += ANIMATION_FRAME_STEP_FACTOR
+    return {
+        'full_wave': full_wave_data,
+        'cycle': cycle,
+    }
+
+
+def calculate_cached_parts(cache, current_state, x):
+    key = geometry_cache_key(current_state)
+    entry = cache.get(key)
+    if entry is not None:
+        parts = entry['cycle'].get(round(x, GEOMETRY_CACHE_X_PRECISION))
+        if parts is not None:
+            return parts
+        return calculate_parts(current_state, x, entry['full_wave'])
+
+    # Only complete entries go under the key, or the prefetcher would take
+    # it as cached and never fill it. Until it does, the full wave is kept
+    # on its own, rather than recalculated every frame.
+    full_wave_key = (key, 'full_wave')
+    full_wave_data = cache.get(full_wave_key)
+    if full_wave_data is None:
+        full_wave_data = calculate_full_wave(current_state)
+        cache.put(full_wave_key, full_wave_data)
+    return calculate_parts(current_state, x, full_wave_data)
+
+
+def prefetch_neighbours(state, prefetcher, prop, slider):
+    def fn(change):
+        value = change['new']
+        current_state = state.get_all() | {prop: value}
+        neighbours = [
+            v for v in (value - slider.step, value + slider.step)
+            if slider.min <= v <= slider.max
+        ]
+        prefetcher.prefetch([geometry_cache_key(current_state | {prop: v}) for v in neighbours])
+    return fn
+
+
+def calculate_frame(state, cache=None, graph=None, lod=None):
+    if graph is None and cache is None:
+        graph = define_dependency_graph()
+
     def fn(frame_data):
         current_state = state.get_all()
 
+        # Get the specifics for this particular frame.
+        x, changed = itemgetter(
+            FrameField.X,
+            FrameField.CHANGED,
+        )(frame_data)
+
+        # Cached geometry is always at full detail.
+        detail = 0
+        if cache is not None:
+            parts = calculate_cached_parts(cache, current_state, x)
+            title = format_title(current_state)
+        else:
+            detail = 0 if lod is None else lod.level
+            parts = calculate_graph_parts(graph, current_state, x, detail)
+            title = graph.get(DerivedValue.TITLE)
+
+        return {
+            FrameField.X: x,
+            FrameField.CHANGED: changed,
+            FrameField.STATE: current_state,
+            FrameField.PARTS: parts,
+            FrameField.TITLE: title,
+            FrameField.DETAIL: detail,
+        }
+    return fn
+
+
+def calculate_batch_parts(current_states, xs, full_waves):
+    # The frame-by-frame geometry of many figures at once. Period waves have
+    # different numbers of samples, so they're calculated on a shared grid
+    # and each row is cut to its own length.
+    def column(prop):
+        return np.array([float(v[prop]) for v in current_states])
+
+    is_cosine = np.array([
+        ToggleButtonOption(v[StateProp.TRIG_FUNCTION]) == ToggleButtonOption.COSINE
+        for v in current_states
+    ])
+    phase_shift = column(StateProp.PHASE_SHIFT)
+    vertical_shift = column(StateProp.VERTICAL_SHIFT)
+    horizontal_scalar = column(StateProp.HORIZONTAL_SCALAR)
+    vertical_scalar = column(StateProp.VERTICAL_SCALAR)
+
+    period_x = phase_shift + np.asarray(xs, dtype=float)
+    steps = np.abs((period_x * vertical_scalar * ANIMATION_STEP_FACTOR).astype(int))
+    t = np.arange(steps.max(initial=0))
+    ranges = phase_shift[:, None] + (period_x - phase_shift)[:, None] * t / np.maximum(steps - 1, 1)[:, None]
+    # cos(a) = sin(a + π/2), so one sin covers both trig functions.
+    angles = horizontal_scalar[:, None] * (ranges - phase_shift[:, None]) + np.where(is_cosine, np.pi / 2, 0)[:, None]
+    ys = vertical_scalar[:, None] * np.sin(angles) + vertical_shift[:, None]
+    theta_xs = period_x[:, None] + np.cos(ranges) * THETA_CIRCLE_FACTOR
+    theta_ys = vertical_shift[:, None] + np.sin(ranges) * THETA_CIRCLE_FACTOR
+    latest_xs = period_x + vertical_scalar * np.cos(horizontal_scalar * period_x)
+    latest_ys = vertical_shift + vertical_scalar * np.sin(horizontal_scalar * period_x)
+
+    # The last sample of each row, or 0 for rows without any.
+    rows = np.arange(len(steps))
+    last = np.maximum(steps - 1, 0)
+    has_samples = steps > 0
+    if t.size:
+        point_ys = np.where(has_samples, ys[rows, last], 0)
+        theta_ends_x = np.where(has_samples, theta_xs[rows, last], 0)
+        theta_ends_y = np.where(has_samples, theta_ys[rows, last], 0)
+    else:
+        point_ys = theta_ends_x = theta_ends_y = np.zeros(len(steps))
+
+    batch = []
+    for i, n in enumerate(steps):
+        period_wave_data = {
+            'x': period_x[i],
+            'y': point_ys[i],
+            'range': ranges[i, :n],
+            'ys': ys[i, :n],
+        }
+        circle_data = {
+            'x': period_x[i],
+            'y': vertical_shift[i],
+            'radius': vertical_scalar[i],
+        }
+        theta_circle_data = {
+            'x': theta_xs[i, :n],
+            'y': theta_ys[i, :n],
+        }
+        arm_data = {
+            'x1': theta_ends_x[i],
+            'x2': latest_xs[i],
+            'y1': theta_ends_y[i],
+            'y2': latest_ys[i],
+        }
+        batch.append(assemble_parts(full_waves[i], period_wave_data, circle_data, theta_circle_data, arm_data))
+    return batch
+
+
+def calculate_frame_batch(contexts, frames_data):
+    # Each context holds a figure's state and dependency graph. The graphs
+    # keep the full wave and title, which only change with the state.
+    current_states = []
+    full_waves = []
+    titles = []
+    for context, frame_data in zip(contexts, frames_data):
+        state, graph = itemgetter('state', 'graph')(context)
+        current_state = state.get_all()
+        set_graph_inputs(graph, current_state, frame_data[FrameField.X])
+        current_states.append(current_state)
+        full_waves.append(graph.get(DerivedValue.FULL_WAVE))
+        titles.append(graph.get(DerivedValue.TITLE))
+
+    xs = [frame_data[FrameField.X] for frame_data in frames_data]
+    batch = calculate_batch_parts(current_states, xs, full_waves)
+    return [
+        {
+            FrameField.X: frame_data[FrameField.X],
+            FrameField.CHANGED: frame_data[FrameField.CHANGED],
+            FrameField.STATE: current_state,
+            FrameField.PARTS: parts,
+            FrameField.TITLE: title,
+            FrameField.DETAIL: 0,
+        }
+        for frame_data, current_state, parts, title in zip(frames_data, current_states, batch, titles)
+    ]
+
+
+def draw_frame(animated_parts, recorder=None):
+    def fn(frame):
+        changed, title, detail, part_values = itemgetter(
+            FrameField.CHANGED,
+            FrameField.TITLE,
+            FrameField.DETAIL,
+            FrameField.PARTS,
+        )(frame)
+
         # Get the elements of the plot that we want to animate.
         circle, theta_circle, point, period_wave, full_wave, terminal_arm, connecting_arm = itemgetter(
             AnimatedPart.CIRCLE,
@@ -509,135 +1116,681 @@ def animate(animated_parts, state):
             AnimatedPart.TERMINAL_ARM,
             AnimatedPart.CONNECTING_ARM,
         )(animated_parts)
-        # Get the specifics for this particular frame.
-        x, changed = itemgetter(
-            FrameField.X,
-            FrameField.CHANGED,
-        )(frame_data)
 
-        sine_wave, cosine_wave, wave_equation = itemgetter(
-            'sine_wave',
-            'cosine_wave',
-            'wave_equation',
-        )(define_wave_functions(current_state))
+        if recorder is not None:
+            recorder.record(encode_clip_row(frame))
 
         # Update animated elements
         if changed:
-            update_title(values=current_state)
-
-        update_full_wave(
-            element=full_wave,
-            values=calculate_full_wave_data({
-                'wave_equation': wave_equation,
-                StateProp.HORIZONTAL_SCALAR:
-                    current_state[StateProp.HORIZONTAL_SCALAR],
-                StateProp.VERTICAL_SCALAR:
-                    current_state[StateProp.VERTICAL_SCALAR],
-            })
-        )
+            update_title(element=full_wave.axes, title=title)
+
+        update_full_wave(element=full_wave, values=part_values[AnimatedPart.FULL_WAVE])
+        update_period_wave(element=period_wave, values=part_values[AnimatedPart.PERIOD_WAVE])
+        update_point(element=point, values=part_values[AnimatedPart.POINT])
+        update_circle(element=circle, values=part_values[AnimatedPart.CIRCLE])
+        # Levels of detail without the theta circle hide it, rather than
+        # leave it where it was while everything else moves on.
+        show_theta_circle = LOD_LEVELS[detail]['theta_circle']
+        theta_circle.set_visible(show_theta_circle)
+        if show_theta_circle:
+            update_theta_circle(element=theta_circle, values=part_values[AnimatedPart.THETA_CIRCLE])
+        update_terminal_arm(element=terminal_arm, values=part_values[AnimatedPart.TERMINAL_ARM])
+        update_connecting_arm(element=connecting_arm, values=part_values[AnimatedPart.CONNECTING_ARM])
 
-        period_wave_data = calculate_period_wave_data({
-            'wave_equation': wave_equation,
-            'step_x': x,
-            StateProp.PHASE_SHIFT: current_state[StateProp.PHASE_SHIFT],
-            StateProp.VERTICAL_SCALAR: current_state[StateProp.VERTICAL_SCALAR],
-        })
-        update_period_wave(
-            element=period_wave,
-            values={
-                'range': period_wave_data['range'],
-                'ys': period_wave_data['ys'],
-            }
-        )
-        update_point(
-            element=point,
-            values={
-                'x': period_wave_data['x'],
-                'y': period_wave_data['y'],
-            }
+        return circle, theta_circle, point, period_wave, full_wave, terminal_arm, connecting_arm
+    return fn
+
+
+def animate(animated_parts, state, recorder=None, cache=None, lod=None, graph=None):
+    calculate = calculate_frame(state, cache, graph, lod)
+    draw = draw_frame(animated_parts, recorder)
+    def fn(frame_data):
+        return draw(calculate(frame_data))
+    return fn
+
+
+def animate_precomputed(animated_parts, producer, recorder=None):
+    draw = draw_frame(animated_parts, recorder)
+    def fn(_):
+        # Geometry is calculated ahead of time on the producer's thread. If it
+        # hasn't caught up, leave the plot as it is until the next frame.
+        frame = producer.pop()
+        if frame is None:
+            return tuple(animated_parts.values())
+        return draw(frame)
+    return fn
+
+def define_input_version(state, coalescer=None):
+    # Slider events waiting in the coalescer make a frame stale too, even
+    # though they haven't reached the state yet.
+    def fn():
+        if coalescer is None:
+            return state.version()
+        return state.version(), coalescer.pushed
+    return fn
+
+def define_frame_key(state, ax, coalescer=None, lod=None, zoom=None):
+    # A frame that follows a change also redraws the title, outside the
+    # animated artists, so it's never cached or reused. The axes' limits
+    # change when the wave is zoomed or panned. A reused frame skips the
+    # animate function, which would apply new limits, so they're applied
+    # here, before the key is made.
+    version = define_input_version(state, coalescer)
+    def fn(frame_data):
+        if zoom is not None:
+            zoom[ZoomPart.APPLY]()
+        if frame_data[FrameField.CHANGED]:
+            return None
+        return (
+            version(),
+            frame_data[FrameField.STEP],
+            lod.level if lod is not None else 0,
+            ax.get_xlim(),
         )
+    return fn
 
-        circle_origin_x = period_wave_data['x']
-        circle_origin_y = current_state[StateProp.VERTICAL_SHIFT]
-        theta_circle_x = circle_origin_x + (np.cos(period_wave_data['range']) * THETA_CIRCLE_FACTOR)
-        theta_circle_y = circle_origin_y + (np.sin(period_wave_data['range']) * THETA_CIRCLE_FACTOR)
-        update_circle(
-            element=circle,
-            values={
-                'x': circle_origin_x,
-                'y': circle_origin_y,
-                'radius': current_state[StateProp.VERTICAL_SCALAR],
-            }
+
+def generate_live_signal(wave_values, seed=LIVE_SIGNAL_SEED):
+    # Rows of (x, y). x sweeps across the axes and starts over, and y is the
+    # wave at x plus some noise.
+    wave_equation = define_wave_functions(wave_values)['wave_equation']
+    rng = np.random.default_rng(seed)
+    width = MAX_X - MIN_X
+    def fn(start, count):
+        t = np.arange(start, start + count) / LIVE_SIGNAL_RATE
+        xs = MIN_X + (t / LIVE_SIGNAL_SWEEP_SECONDS % 1) * width
+        ys = wave_equation(xs) + rng.normal(0, LIVE_SIGNAL_NOISE, count)
+        return np.column_stack((xs, ys))
+    return fn
+
+def define_live_signal():
+    # One sweep's worth of samples.
+    buffer = RingBuffer(int(LIVE_SIGNAL_RATE * LIVE_SIGNAL_SWEEP_SECONDS), width=2)
+    source = SocketSignalSource(buffer, generate_live_signal(LIVE_SIGNAL_WAVE), LIVE_SIGNAL_RATE)
+    return buffer, source
+
+def define_live_signal_line(ax):
+    line, = ax.plot(
+        [], [],
+        lw=LineWidth.THIN.value,
+        color=Color.ORANGE.value,
+    )
+    return line
+
+def animate_live_signal(animate_fn, line, buffer):
+    def fn(frame_data):
+        artists = animate_fn(frame_data)
+        # Thousands of samples come down to a low and a high per pixel column.
+        rows = buffer.latest()
+        xs, ys = min_max_decimate(rows[:, 0], rows[:, 1], (MIN_X, MAX_X), max(1, int(line.axes.bbox.width)))
+        line.set_data(xs, ys)
+        return tuple(artists) + (line,)
+    return fn
+
+def animate_zoomable(animate_fn, full_wave, view):
+    def fn(frame_data):
+        artists = animate_fn(frame_data)
+        full_wave.set_data(*view())
+        return artists
+    return fn
+
+def animate_overlays(animate_fn, animated_parts, live_signal=None, zoom=None):
+    if live_signal is not None:
+        animate_fn = animate_live_signal(animate_fn, *live_signal)
+    if zoom is not None:
+        animate_fn = animate_zoomable(animate_fn, animated_parts[AnimatedPart.FULL_WAVE], zoom[ZoomPart.VIEW])
+    return animate_fn
+
+def define_pyramid(values):
+    # As many samples for each period of the wave, whatever its frequency.
+    wave_equation = define_wave_functions(values)['wave_equation']
+    periods = 2 * ZOOM_DOMAIN_PERIODS * max(1, values[StateProp.HORIZONTAL_SCALAR])
+    return SamplePyramid(
+        wave_equation,
+        (-ZOOM_DOMAIN_PERIODS * TWO_PI, ZOOM_DOMAIN_PERIODS * TWO_PI),
+        int(periods * ZOOM_SAMPLES_PER_PERIOD) + 1,
+    )
+
+def define_zoom(fig, ax, state):
+    # The equal aspect ratio sized the axes' box for the default limits.
+    # Keep the box as it is, so zooming stretches the x axis instead.
+    ax.apply_aspect()
+    ax.set_position(ax.get_position(original=False))
+    ax.set_aspect('auto')
+
+    # The pyramid is rebuilt when the state changes.
+    pyramids = {}
+    def pyramid():
+        version = state.version()
+        if version not in pyramids:
+            pyramids.clear()
+            pyramids[version] = define_pyramid(state.get_all())
+        return pyramids[version]
+
+    # Scrolling and dragging fire many events between frames, and a redraw
+    # of the whole figure for each would be far from cheap. So they only
+    # record the limits, and the next frame applies the latest and redraws
+    # once, which also saves the new background for blitting.
+    pending = {}
+    def xlim():
+        return pending.get('xlim', ax.get_xlim())
+
+    def apply():
+        if 'xlim' in pending:
+            ax.set_xlim(*pending.pop('xlim'))
+            fig.canvas.draw()
+
+    def view():
+        apply()
+        return pyramid().view(ax.get_xlim(), max(1, int(ax.bbox.width)))
+
+    def set_xlim(x0, x1):
+        domain_x0, domain_x1 = pyramid().domain
+        width = min(max(x1 - x0, ZOOM_MIN_WIDTH), domain_x1 - domain_x0)
+        x0 = min(max(x0, domain_x0), domain_x1 - width)
+        pending['xlim'] = (x0, x0 + width)
+
+    def on_scroll(event):
+        if event.inaxes is not ax:
+            return
+        x0, x1 = xlim()
+        scale = ZOOM_FACTOR ** -event.step
+        set_xlim(event.xdata - (event.xdata - x0) * scale, event.xdata + (x1 - event.xdata) * scale)
+
+    drag = {}
+    def on_press(event):
+        if event.inaxes is ax:
+            drag['start'] = (event.x, xlim())
+
+    def on_motion(event):
+        if 'start' not in drag:
+            return
+        start, (x0, x1) = drag['start']
+        shift = (start - event.x) * (x1 - x0) / ax.bbox.width
+        set_xlim(x0 + shift, x1 + shift)
+
+    def on_release(event):
+        drag.pop('start', None)
+
+    fig.canvas.mpl_connect('scroll_event', on_scroll)
+    fig.canvas.mpl_connect('button_press_event', on_press)
+    fig.canvas.mpl_connect('motion_notify_event', on_motion)
+    fig.canvas.mpl_connect('button_release_event', on_release)
+    return {
+        ZoomPart.VIEW: view,
+        ZoomPart.APPLY: apply,
+    }
+
+def define_lod(animated_parts):
+    # Drawing the animated parts without antialiasing is cheaper, and unlike
+    # lowering the dpi, leaves the figure's size in pixels as it is.
+    def on_change(level):
+        for part in animated_parts.values():
+            part.set_antialiased(LOD_LEVELS[level]['antialiased'])
+
+    return LevelOfDetail(
+        len(LOD_LEVELS),
+        ANIMATION_INTERVAL / 1000,
+        window=LOD_WINDOW,
+        on_change=on_change,
+    )
+
+def define_animation(fig, animated_parts, state, coalescer=None, recorder=None, cache=None, resources=None, lod=None, live_signal=None, zoom=None, graph=None):
+    if ANIMATION_ASYNCIO_DRIVER:
+        from utils.animation.async_driver import AsyncFrameDriver
+
+        # The driver calculates and draws a frame separately, so the live
+        # signal and zoom are drawn along with the rest of the frame.
+        return AsyncFrameDriver(
+            fig,
+            generate_frames(state, coalescer),
+            calculate_frame(state, cache, graph, lod),
+            animate_overlays(draw_frame(animated_parts, recorder), animated_parts, live_signal, zoom),
+            define_input_version(state, coalescer),
+            ANIMATION_INTERVAL,
+            on_frame=lod.record if lod is not None else None,
+        ).start()
+
+    if ANIMATION_PRECOMPUTE_FRAMES:
+        producer = FrameProducer(
+            generate_frames(state, coalescer),
+            calculate_frame(state, cache, graph, lod),
+            state.version,
+            maxsize=ANIMATION_PRECOMPUTE_QUEUE_SIZE,
+        ).start()
+        if resources is not None:
+            resources.stoppable(producer)
+        animate_fn = animate_precomputed(animated_parts, producer, recorder)
+        frames = None
+    else:
+        animate_fn = animate(animated_parts, state, recorder, cache, lod, graph)
+        frames = generate_frames(state, coalescer)
+
+    animate_fn = animate_overlays(animate_fn, animated_parts, live_signal, zoom)
+
+    # Reusing a frame needs its x, which precomputed frames don't pass on, and
+    # skips drawing it, which a clip recording or a live signal can't.
+    if FRAME_CACHE and frames is not None and recorder is None and live_signal is None:
+        from utils.animation.cached_animation import CachedFuncAnimation, frame_size
+
+        return CachedFuncAnimation(
+            fig,
+            animate_fn,
+            key=define_frame_key(state, animated_parts[AnimatedPart.FULL_WAVE].axes, coalescer, lod, zoom),
+            cache=ByteLRUCache(FRAME_CACHE_BYTES, frame_size),
+            on_frame=lod.record if lod is not None else None,
+            interval=ANIMATION_INTERVAL,
+            frames=frames,
+            blit=True,
+            cache_frame_data=False,
+            repeat=False,
+            save_count=ANIMATION_SAVE_COUNT,
         )
-        update_theta_circle(
-            element=theta_circle,
-            values={
-                'x': theta_circle_x,
-                'y': theta_circle_y,
-            }
+
+    # Time each frame, so the level of detail can follow the frame rate.
+    if lod is not None:
+        from utils.animation.timed_animation import TimedFuncAnimation
+
+        return TimedFuncAnimation(
+            fig,
+            animate_fn,
+            on_frame=lod.record,
+            interval=ANIMATION_INTERVAL,
+            frames=frames,
+            blit=True,
+            cache_frame_data=False,
+            repeat=False,
+            save_count=ANIMATION_SAVE_COUNT,
         )
 
-        arm_data = calculate_terminal_arm_data({
-            'cosine_wave': cosine_wave,
-            'sine_wave': sine_wave,
-            'period_x': period_wave_data['x'],
-            StateProp.VERTICAL_SCALAR: current_state[StateProp.VERTICAL_SCALAR],
-            StateProp.HORIZONTAL_SCALAR: current_state[StateProp.HORIZONTAL_SCALAR],
-            'origin_x': circle_origin_x,
-            'origin_y': circle_origin_y,
-            'theta_x': theta_circle_x,
-            'theta_y': theta_circle_y,
-            
-        })
-        update_terminal_arm(
-            element=terminal_arm,
-            values={
-                'x1': arm_data['x1'],
-                'x2': arm_data['x2'],
-                'y1': arm_data['y1'],
-                'y2': arm_data['y2'],
-            }
+    import matplotlib.animation as animation
+
+    return animation.FuncAnimation(
+        fig,
+        animate_fn,
+        interval=ANIMATION_INTERVAL,
+        frames=frames,
+        blit=True,
+        cache_frame_data=False,
+        repeat=False,
+        save_count=ANIMATION_SAVE_COUNT,
+    )
+
+def define_dashboard(count):
+    import matplotlib.pyplot as plt
+    from ipywidgets import HBox, VBox
+
+    figures = []
+    graphs = []
+    rows = []
+    multiplexer = None
+    for _ in range(count):
+        state = define_initial_state()
+        fig, animated_parts = itemgetter(
+            PlotPart.FIG,
+            PlotPart.ANIMATED_PARTS
+        )(define_plot(plt))
+        # The first figure's timer drives all of them.
+        if multiplexer is None:
+            multiplexer = AnimationMultiplexer(
+                fig.canvas.new_timer(interval=ANIMATION_INTERVAL),
+                calculate_frame_batch,
+                DASHBOARD_TICK_BUDGET,
+            )
+        graph = define_dependency_graph()
+        multiplexer.add(
+            fig,
+            generate_frames(state),
+            draw_frame(animated_parts),
+            {'state': state, 'graph': graph},
         )
-        update_connecting_arm(
-            element=connecting_arm,
-            values={
-                'x1': arm_data['x2'],
-                'x2': period_wave_data['x'],
-                'y1': arm_data['y2'],
-                'y2': period_wave_data['y'],
-            },
+        figures.append(fig)
+        graphs.append(graph)
+        rows.append(HBox([define_ui(state), fig.canvas]))
+
+    return {
+        'multiplexer': multiplexer,
+        'figures': figures,
+        'graphs': graphs,
+        'container': VBox(rows),
+    }
+
+def timer_interval(timer):
+    # Applies an idle throttle's interval to a matplotlib timer.
+    def fn(interval):
+        if interval is None:
+            timer.stop()
+        else:
+            timer.interval = interval
+            timer.start()
+    return fn
+
+def play_interval(play):
+    # Applies an idle throttle's interval to a Play widget.
+    def fn(interval):
+        if interval is None:
+            play.playing = False
+        else:
+            play.interval = interval
+            play.playing = True
+    return fn
+
+def driver_interval(driver):
+    # Applies an idle throttle's interval to an AsyncFrameDriver.
+    def fn(interval):
+        if interval is None:
+            driver.stop()
+        else:
+            driver.interval = interval
+            driver.start()
+    return fn
+
+def define_idle_throttle(set_interval, state):
+    return IdleThrottle(
+        set_interval,
+        ANIMATION_INTERVAL,
+        IDLE_THROTTLED_INTERVAL,
+        IDLE_THROTTLE_AFTER,
+        IDLE_PAUSE_AFTER,
+        version=state.version,
+    )
+
+def define_canvas():
+    import matplotlib
+    from utils.notebooks.circle_sinosoidal.canvas_backend import SinusoidCanvas
+
+    def line_style(color, line_width):
+        return {'color': color.value, 'line_width': line_width.value}
+
+    return SinusoidCanvas(
+        bounds=(-TWO_PI, FOUR_PI, MIN_Y, MAX_Y),
+        styles={
+            'title': {'color': Color.LIGHT_GRAY.value},
+            'axes': line_style(Color.LIGHT_GRAY, LineWidth.THIN),
+            AnimatedPart.CIRCLE.value: {'color': Color.BLACK.value, 'line_width': 1},
+            AnimatedPart.THETA_CIRCLE.value: line_style(Color.GRAY, LineWidth.THIN),
+            AnimatedPart.PERIOD_WAVE.value: line_style(Color.BLUE, LineWidth.THICK),
+            AnimatedPart.FULL_WAVE.value: line_style(Color.LIGHT_BLUE, LineWidth.THIN),
+            AnimatedPart.POINT.value: {'color': Color.BLUE.value},
+            AnimatedPart.TERMINAL_ARM.value: line_style(Color.GRAY, LineWidth.THIN),
+            AnimatedPart.CONNECTING_ARM.value: line_style(Color.GRAY, LineWidth.THIN),
+        },
+        # The dpi define_plot()'s figure has, so lines are as wide as in it.
+        dpi=matplotlib.rcParams['figure.dpi'],
+    )
+
+
+def draw_canvas_frame(sinusoid_canvas, recorder=None):
+    def fn(frame):
+        changed, title, part_values = itemgetter(
+            FrameField.CHANGED,
+            FrameField.TITLE,
+            FrameField.PARTS,
+        )(frame)
+        if recorder is not None:
+            recorder.record(encode_clip_row(frame))
+        sinusoid_canvas.draw(
+            {k.value: v for k, v in part_values.items()},
+            title=title if changed else None,
         )
+        return sinusoid_canvas
+    return fn
 
-        return circle, theta_circle, point, period_wave, full_wave, terminal_arm, connecting_arm
+
+def define_play_animation(draw, state, coalescer=None, cache=None, graph=None):
+    from ipywidgets import Layout, Play
+
+    # The frontend's Play widget acts as the animation timer, much as it
+    # drives the steps in the "Difference of Squares" notebook.
+    frames = generate_frames(state, coalescer)()
+    calculate = calculate_frame(state, cache, graph)
+    play = Play(
+        interval=ANIMATION_INTERVAL,
+        max=ANIMATION_SAVE_COUNT,
+        repeat=True,
+        playing=True,
+        layout=Layout(display='none'),
+    )
+    play.observe(lambda _: draw(calculate(next(frames))), names='value')
+    draw(calculate(next(frames)))
+    return play
+
+def define_canvas_animation(sinusoid_canvas, state, coalescer=None, recorder=None, cache=None, graph=None):
+    return define_play_animation(
+        draw_canvas_frame(sinusoid_canvas, recorder),
+        state,
+        coalescer,
+        cache,
+        graph,
+    )
+
+def define_transport():
+    from utils.graphics import offscreen
+    from utils.graphics.region_transport import RegionTransport
+
+    fig, animated_parts = itemgetter(
+        PlotPart.FIG,
+        PlotPart.ANIMATED_PARTS
+    )(define_plot(offscreen))
+    # The full wave only changes with the state, when the title does, so it
+    # can stay in the background.
+    transport = RegionTransport(
+        fig,
+        [v for k, v in animated_parts.items() if k != AnimatedPart.FULL_WAVE],
+        scale=TRANSPORT_SCALE,
+        image_format=TRANSPORT_FORMAT,
+        quality=TRANSPORT_QUALITY,
+    )
+    return transport, animated_parts
+
+def draw_transport_frame(transport, animated_parts, recorder=None):
+    draw = draw_frame(animated_parts, recorder)
+    def fn(frame):
+        draw(frame)
+        # A new title is part of the background, so everything is resent.
+        transport.render(full=frame[FrameField.CHANGED])
+        return transport
     return fn
 
-state = State()
-state.define({
-    StateProp.MODIFIED: False,
-    StateProp.TRIG_FUNCTION: ToggleButtonOption.SINE,
-    StateProp.PHASE_SHIFT: 0,
-    StateProp.VERTICAL_SHIFT: 0,
-    StateProp.HORIZONTAL_SCALAR: 1,
-    StateProp.VERTICAL_SCALAR: 1,
-})
-
-ui = define_ui(state)
-
-fig, animated_parts = itemgetter(
-    PlotPart.FIG,
-    PlotPart.ANIMATED_PARTS
-)(define_plot(plt))
-
-ani = animation.FuncAnimation(
-    fig,
-    animate(animated_parts, state),
-    interval=ANIMATION_INTERVAL,
-    frames=generate_frames(state),
-    blit=True,
-    cache_frame_data=False,
-    repeat=False,
-    save_count=ANIMATION_SAVE_COUNT,
-)
-
-display(ui)
-display(ani)
+def define_transport_animation(transport, animated_parts, state, coalescer=None, recorder=None, cache=None, graph=None):
+    return define_play_animation(
+        draw_transport_frame(transport, animated_parts, recorder),
+        state,
+        coalescer,
+        cache,
+        graph,
+    )
+
+# Columns of a recorded clip row. Together they're enough to redraw a frame.
+CLIP_COLUMNS = [
+    FrameField.X,
+    FrameField.CHANGED,
+    StateProp.TRIG_FUNCTION,
+    StateProp.PHASE_SHIFT,
+    StateProp.VERTICAL_SHIFT,
+    StateProp.HORIZONTAL_SCALAR,
+    StateProp.VERTICAL_SCALAR,
+]
+TRIG_FUNCTION_OPTIONS = list(ToggleButtonOption)
+
+
+def encode_clip_row(frame):
+    values = frame[FrameField.STATE] | {
+        FrameField.X: frame[FrameField.X],
+        FrameField.CHANGED: frame[FrameField.CHANGED],
+    }
+    values[StateProp.TRIG_FUNCTION] = TRIG_FUNCTION_OPTIONS.index(
+        ToggleButtonOption(values[StateProp.TRIG_FUNCTION])
+    )
+    return [float(values[column]) for column in CLIP_COLUMNS]
+
+
+def decode_clip_row(row):
+    values = dict(zip(CLIP_COLUMNS, row.tolist()))
+    values[StateProp.TRIG_FUNCTION] = TRIG_FUNCTION_OPTIONS[int(values[StateProp.TRIG_FUNCTION])].value
+    frame_data = {
+        FrameField.I: 0,
+        FrameField.X: values.pop(FrameField.X),
+        FrameField.CHANGED: bool(values.pop(FrameField.CHANGED)),
+    }
+    return values, frame_data
+
+
+def save_clip(recorder, path, on_done=None):
+    from utils.graphics import offscreen
+
+    # Draw into a figure of its own, outside of pyplot, so the clip can be
+    # encoded on a background thread while the live animation keeps going.
+    fig, animated_parts = itemgetter(
+        PlotPart.FIG,
+        PlotPart.ANIMATED_PARTS
+    )(define_plot(offscreen))
+    clip_state = State({StateProp.MODIFIED: False})
+    calculate = calculate_frame(clip_state)
+    draw = draw_frame(animated_parts)
+
+    def draw_row(i, row):
+        values, frame_data = decode_clip_row(row)
+        clip_state.set_multiple(values)
+        # The first frame needs a title, whether or not it changed.
+        frame_data[FrameField.CHANGED] = frame_data[FrameField.CHANGED] or i == 0
+        draw(calculate(frame_data))
+
+    return recorder.save_async(
+        path,
+        fig,
+        draw_row,
+        fps=1000 / ANIMATION_INTERVAL,
+        on_done=on_done,
+    )
+
+
+def define_clip_controls(recorder):
+    from ipywidgets import Button, HBox, Label, Layout
+
+    button = Button(description='Save clip', icon='film')
+    status = Label(layout=Layout(margin='0 0 0 1rem'))
+
+    def on_saved(path, error):
+        if error is None:
+            status.value = f'Saved {path}'
+        else:
+            status.value = f"Couldn't save {path}: {error}"
+
+    def on_click(_):
+        path = f'{NOTEBOOK_FILE_NAME}_clip.{CLIP_FILE_EXTENSION}'
+        if len(recorder) == 0:
+            status.value = 'Nothing has been recorded yet.'
+            return
+        status.value = f'Saving the last {len(recorder) * ANIMATION_INTERVAL / 1000:.1f}s...'
+        save_clip(recorder, path, on_done=on_saved)
+
+    button.on_click(on_click)
+    return HBox(
+        children=[button, status],
+        layout=Layout(margin='1rem 0 0 0', align_items='center'),
+    )
+
+def main():
+    # Sets up and displays the controls and animation. Returns what the
+    # animation needs to keep running, which the caller has to hold on to.
+    import matplotlib.pyplot as plt
+    from ipywidgets import VBox
+    from IPython.display import display
+
+    # Running the cell again disposes of everything the previous run created:
+    # figures, timers, background threads and widgets.
+    resources = lifecycle.begin(NOTEBOOK_FILE_NAME)
+
+    if DASHBOARD_FIGURES > 1:
+        dashboard = define_dashboard(DASHBOARD_FIGURES)
+        resources.widget(dashboard['container'])
+        for fig in dashboard['figures']:
+            resources.figure(fig)
+        resources.stoppable(dashboard['multiplexer'])
+        display(dashboard['container'])
+        dashboard['multiplexer'].start()
+        return {
+            'resources': resources,
+            'animation': dashboard['multiplexer'],
+            'graphs': dashboard['graphs'],
+        }
+
+    state = define_initial_state()
+
+    coalescer = UpdateCoalescer(SLIDER_DRAG_SETTLE_TIME) if SLIDER_CONTINUOUS_UPDATE else None
+    cache = ByteLRUCache(GEOMETRY_CACHE_BYTES) if GEOMETRY_PREFETCH else None
+    prefetcher = Prefetcher(calculate_cycle_geometry, cache) if GEOMETRY_PREFETCH else None
+    if prefetcher is not None:
+        resources.track(prefetcher, lambda p: p.shutdown())
+    recorder = ClipRecorder(CLIP_FRAMES, len(CLIP_COLUMNS)) if CLIP_RECORDING else None
+    # Frames are calculated through the graph unless they come from the cache.
+    # Its recomputed counters show what each state change recalculated.
+    graph = define_dependency_graph() if cache is None else None
+    idle = None
+    transport = None
+
+    if ANIMATION_BACKEND == AnimationBackend.CANVAS:
+        sinusoid_canvas = define_canvas()
+        ani = define_canvas_animation(sinusoid_canvas, state, coalescer, recorder, cache, graph)
+        if IDLE_THROTTLING:
+            idle = define_idle_throttle(play_interval(ani), state)
+            ani.observe(lambda _: idle.tick(), names='value')
+        animation_view = resources.widget(VBox([ani, sinusoid_canvas.canvas]))
+    elif ANIMATION_BACKEND == AnimationBackend.REGIONS:
+        transport, animated_parts = define_transport()
+        ani = define_transport_animation(transport, animated_parts, state, coalescer, recorder, cache, graph)
+        if IDLE_THROTTLING:
+            idle = define_idle_throttle(play_interval(ani), state)
+            ani.observe(lambda _: idle.tick(), names='value')
+        animation_view = resources.widget(VBox([ani, transport.canvas]))
+    else:
+        fig, axes, animated_parts = itemgetter(
+            PlotPart.FIG,
+            PlotPart.AXES,
+            PlotPart.ANIMATED_PARTS
+        )(define_plot(plt))
+        resources.figure(fig)
+
+        live_signal = None
+        if LIVE_SIGNAL:
+            buffer, source = define_live_signal()
+            resources.stoppable(source.start())
+            live_signal = (define_live_signal_line(axes[0]), buffer)
+
+        lod = define_lod(animated_parts) if ANIMATION_LOD else None
+        zoom = define_zoom(fig, axes[0], state) if ZOOM_AND_PAN else None
+        ani = define_animation(fig, animated_parts, state, coalescer, recorder, cache, resources, lod, live_signal, zoom, graph)
+        if ANIMATION_ASYNCIO_DRIVER:
+            resources.stoppable(ani)
+            animation_view = fig.canvas
+            if IDLE_THROTTLING:
+                idle = define_idle_throttle(driver_interval(ani), state)
+                ani.add_callback(idle.tick)
+        else:
+            resources.animation(ani)
+            animation_view = ani
+            if IDLE_THROTTLING:
+                idle = define_idle_throttle(timer_interval(ani.event_source), state)
+                ani.event_source.add_callback(idle.tick)
+
+    ui = define_ui(state, coalescer, prefetcher, idle.touch if idle is not None else None)
+    if recorder is not None:
+        ui = VBox([ui, define_clip_controls(recorder)])
+    resources.widget(ui)
+
+    display(ui)
+    display(animation_view)
+    return {
+        'resources': resources,
+        'state': state,
+        'animation': ani,
+        'graph': graph,
+        'idle': idle,
+        'transport': transport,
+    }
+
+# Notebook cells (and direct runs) execute as __main__. Importing the module
+# only defines the functions above; nothing is set up until main() runs.
+if __name__ == '__main__':
+    notebook = main()
@@ -0,0 +1,150 @@
+"""
+Provides a class that drives an animation from an asyncio task rather than a
+matplotlib timer, so widget callbacks get a turn between the phases of every
+frame.
+"""
+
+import asyncio
+from time import perf_counter
+
+
+class AsyncFrameDriver:
+    """
+    Runs the frame loop as a task on the running event loop (in Jupyter, the
+    kernel's). Each frame has a deadline one interval after the previous one:
+
+    1. the frame's geometry is calculated,
+    2. control is yielded so pending widget messages are handled,
+    3. the artists are updated,
+    4. control is yielded again,
+    5. the figure is redrawn, and the task sleeps until the deadline.
+
+    If the version changes during a frame (e.g. a slider moved), the rest of
+    the frame is abandoned and a new one is started straight away. A frame
+    that runs past its deadline doesn't try to catch up.
+
+    Stopping and starting again carries on from the frame it stopped at, as
+    a matplotlib timer does.
+    """
+
+    def __init__(
+        self,
+        figure,
+        frames,
+        calculate,
+        draw,
+        version,
+        interval,
+        on_frame=None,
+        clock=perf_counter,
+    ):
+        """
+        The frames argument is a generator function; calculate turns a frame's
+        data into geometry and draw applies it to the artists. The version
+        returns a value that changes whenever pending input makes a frame in
+        progress stale. The interval is in milliseconds. The optional
+        on_frame function is called with the seconds each drawn frame took,
+        from the start of its calculation to the redraw.
+        """
+        self.__figure = figure
+        self.__frames = frames
+        self.__calculate = calculate
+        self.__draw = draw
+        self.__version = version
+        self.__interval = interval / 1000
+        self.__on_frame = on_frame
+        self.__clock = clock
+        self.__callbacks = []
+        self.__frame_iterator = None
+        self.__task = None
+        self.drawn = 0
+        self.preempted = 0
+        self.late = 0
+        self.error = None
+
+    @property
+    def running(self):
+        return self.__task is not None and not self.__task.done()
+
+    @property
+    def interval(self):
+        """The frame interval in milliseconds, applied from the next frame."""
+        return self.__interval * 1000
+
+    @interval.setter
+    def interval(self, interval):
+        self.__interval = interval / 1000
+
+    def add_callback(self, callback):
+        """Adds a function to call, with no arguments, after each drawn frame."""
+        self.__callbacks.append(callback)
+        return self
+
+    def start(self):
+        """Schedules the frame loop on the current event loop."""
+        if not self.running:
+            self.__task = asyncio.get_event_loop().create_task(self.run())
+            self.__task.add_done_callback(self.__on_done)
+        return self
+
+    def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+        return self
+
+    def __on_done(self, task):
+        # Nothing awaits the task, so an error that ends the frame loop is
+        # kept and passed to the event loop's exception handler, which logs
+        # it, rather than lost with the task.
+        if task.cancelled() or task.exception() is None:
+            return
+        self.error = task.exception()
+        task.get_loop().call_exception_handler(
+            {
+                "message": "The animation's frame loop stopped with an error.",
+                "exception": self.error,
+                "task": task,
+            }
+        )
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        if self.__frame_iterator is None:
+            self.__frame_iterator = self.__frames()
+        frames = self.__frame_iterator
+        deadline = loop.time()
+        while True:
+            # Getting the next frame can apply pending input, so the version
+            # is read after it, or the frame that shows the input is dropped.
+            frame_data = next(frames)
+            version = self.__version()
+            start = self.__clock()
+
+            frame = self.__calculate(frame_data)
+            await asyncio.sleep(0)
+            if self.__version() != version:
+                self.preempted += 1
+                continue
+
+            self.__draw(frame)
+            await asyncio.sleep(0)
+            if self.__version() != version:
+                self.preempted += 1
+                continue
+
+            self.__figure.canvas.draw_idle()
+            self.drawn += 1
+            if self.__on_frame is not None:
+                self.__on_frame(self.__clock() - start)
+            # A callback can stop the driver, e.g. to pause it, which cancels
+            # the task at the sleep below.
+            for callback in self.__callbacks:
+                callback()
+
+            deadline += self.__interval
+            delay = deadline - loop.time()
+            if delay < 0:
+                self.late += 1
+                deadline = loop.time()
+            await asyncio.sleep(max(0, delay))
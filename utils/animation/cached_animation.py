@@ -0,0 +1,70 @@
+"""
+Provides a FuncAnimation that keeps the pixels of the frames it draws, so a
+frame that comes round again is copied back rather than recalculated and
+redrawn.
+"""
+
+from .timed_animation import TimedFuncAnimation
+
+BYTES_PER_PIXEL = 4  # RGBA.
+
+
+def frame_size(regions):
+    """Returns the bytes held by a cached frame, for a ByteLRUCache."""
+    return sum(
+        int(bbox.width) * int(bbox.height) * BYTES_PER_PIXEL for bbox, _ in regions
+    )
+
+
+class CachedFuncAnimation(TimedFuncAnimation):
+    """
+    Caches the rendered pixels of each frame, as the regions that blitting
+    updates: the bounding boxes of the animated artists' axes.
+
+    The key function takes a frame's data and returns what the frame shows,
+    as a hashable key, or None for a frame that mustn't be cached or reused,
+    e.g. one that changes more than the animated artists. On a hit, neither
+    the frame function nor the artists' draw runs; the regions are restored
+    and blitted. The figure's size is part of every key, so resizing it, or
+    changing its dpi, doesn't reuse frames of the wrong size.
+    """
+
+    def __init__(self, fig, func, *args, key, cache, **kwargs):
+        """
+        The cache needs get and put, e.g. a ByteLRUCache sized with
+        frame_size. Frames are only cached when blitting.
+        """
+        if not kwargs.get("blit"):
+            raise ValueError("Frames can only be cached when blitting.")
+        self.__key = key
+        self.__cache = cache
+        self.reused = 0
+        self.rendered = 0
+        super().__init__(fig, func, *args, **kwargs)
+
+    def _draw_next_frame(self, framedata, blit):
+        canvas = self._fig.canvas
+        key = self.__key(framedata)
+        if key is not None:
+            key = (canvas.get_width_height(), key)
+            regions = self.__cache.get(key)
+            if regions is not None:
+                for bbox, region in regions:
+                    canvas.restore_region(region)
+                    canvas.blit(bbox)
+                self.reused += 1
+                return
+
+        super()._draw_next_frame(framedata, blit)
+        self.rendered += 1
+        if key is not None:
+            self.__cache.put(key, self.__copy_regions())
+
+    def __copy_regions(self):
+        canvas = self._fig.canvas
+        axes = {artist.axes for artist in self._drawn_artists}
+        return [
+            (ax.bbox.frozen(), canvas.copy_from_bbox(ax.bbox))
+            for ax in axes
+            if ax is not None
+        ]
@@ -0,0 +1,98 @@
+"""
+Provides a class that remembers the last N frames of an animation so they can
+be saved as a clip on demand.
+"""
+
+from threading import Lock, Thread
+import numpy as np
+
+DEFAULT_DPI = 100
+
+
+class ClipRecorder:
+    """
+    A ring buffer of the most recent frames. Each frame is stored as a
+    fixed-width row of numbers (e.g. the state values and x position needed
+    to redraw it), so memory use is fixed at capacity × width when the
+    recorder is created.
+    """
+
+    def __init__(self, capacity, width, dtype=np.float32):
+        self.__rows = np.zeros((capacity, width), dtype=dtype)
+        self.__next = 0
+        self.__count = 0
+        self.__lock = Lock()
+
+    @property
+    def nbytes(self):
+        """The memory held by the buffer."""
+        return self.__rows.nbytes
+
+    def __len__(self):
+        return self.__count
+
+    def record(self, row):
+        """Records a frame, overwriting the oldest once the buffer is full."""
+        with self.__lock:
+            self.__rows[self.__next] = row
+            self.__next = (self.__next + 1) % len(self.__rows)
+            self.__count = min(self.__count + 1, len(self.__rows))
+        return self
+
+    def clear(self):
+        with self.__lock:
+            self.__next = 0
+            self.__count = 0
+        return self
+
+    def snapshot(self):
+        """Returns a copy of the recorded rows, oldest first."""
+        with self.__lock:
+            start = (self.__next - self.__count) % len(self.__rows)
+            indices = (start + np.arange(self.__count)) % len(self.__rows)
+            return self.__rows[indices]
+
+    def save(self, path, figure, draw, fps, rows=None, dpi=DEFAULT_DPI):
+        """
+        Encodes rows (by default a snapshot of the buffer) to a clip. For each
+        row, draw(i, row) updates the figure before the frame is grabbed. A
+        ".gif" path is written with Pillow; anything else goes to ffmpeg.
+        """
+        from matplotlib.animation import FFMpegWriter, PillowWriter
+
+        rows = self.snapshot() if rows is None else rows
+        if len(rows) == 0:
+            raise ValueError("There are no frames to save.")
+        if str(path).lower().endswith(".gif"):
+            writer = PillowWriter(fps=fps)
+        else:
+            writer = FFMpegWriter(fps=fps)
+
+        with writer.saving(figure, path, dpi):
+            for i, row in enumerate(rows):
+                draw(i, row)
+                writer.grab_frame()
+        return path
+
+    def save_async(self, path, figure, draw, fps, on_done=None, dpi=DEFAULT_DPI):
+        """
+        Takes a snapshot now and encodes it on a background thread, so the
+        live animation carries on. The figure must not be the live one. Calls
+        on_done(path, error) once it's finished, where error is None if the
+        clip was written, or the exception that stopped it, e.g. when ffmpeg
+        isn't installed.
+        """
+        rows = self.snapshot()
+
+        def run():
+            error = None
+            try:
+                self.save(path, figure, draw, fps, rows=rows, dpi=dpi)
+            except Exception as e:
+                error = e
+            if on_done is not None:
+                on_done(path, error)
+
+        thread = Thread(target=run, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,102 @@
+"""
+Provides a class that calculates animation frames ahead of time on a background
+thread, so the animation's timer callback only has to draw them.
+"""
+
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+
+DEFAULT_QUEUE_SIZE = 20
+PUT_TIMEOUT = 0.1
+
+
+class FrameProducer:
+    """
+    Pulls frame data from a frames generator, calculates each frame and keeps
+    the results in a bounded queue.
+
+    Each frame is tagged with the state version it was calculated from. Frames
+    whose version no longer matches the current one are dropped when popped,
+    so a state change never shows stale geometry.
+    """
+
+    def __init__(self, frames, calculate, version, maxsize=DEFAULT_QUEUE_SIZE):
+        """
+        The frames argument is a generator function, calculate turns a frame's
+        data into whatever the animation draws, and version returns the
+        current state version.
+        """
+        self.__frames = frames
+        self.__calculate = calculate
+        self.__version = version
+        self.__queue = Queue(maxsize=maxsize)
+        self.__stopped = Event()
+        self.__thread = None
+        self.produced = 0
+        self.dropped = 0
+
+    def start(self):
+        """Starts producing frames on a daemon thread."""
+        self.__stopped.clear()
+        self.__thread = Thread(target=self.__produce, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        """Stops producing frames and discards any that are queued."""
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.clear()
+        return self
+
+    def clear(self):
+        """Discards any queued frames."""
+        self.__drop_queued()
+        return self
+
+    def pop(self):
+        """
+        Returns the next frame calculated from the current state version, or
+        None if there isn't one ready. Stale frames are dropped along the way.
+        """
+        version = self.__version()
+        while True:
+            try:
+                frame_version, frame = self.__queue.get_nowait()
+            except Empty:
+                return None
+            if frame_version == version:
+                return frame
+            self.dropped += 1
+
+    def __produce(self):
+        last_version = None
+        for frame_data in self.__frames():
+            if self.__stopped.is_set():
+                return
+            version = self.__version()
+            if version != last_version:
+                # Everything queued so far is stale, so make room right away.
+                self.__drop_queued()
+                last_version = version
+            item = (version, self.__calculate(frame_data))
+            while not self.__stopped.is_set():
+                try:
+                    self.__queue.put(item, timeout=PUT_TIMEOUT)
+                    self.produced += 1
+                    break
+                except Full:
+                    # The frame went stale while waiting for room; the
+                    # consumer would only drop it.
+                    if version != self.__version():
+                        break
+
+    def __drop_queued(self):
+        while True:
+            try:
+                self.__queue.get_nowait()
+            except Empty:
+                return
+            self.dropped += 1
@@ -0,0 +1,99 @@
+"""
+Provides a class that slows an animation down, then pauses it, when nobody
+has interacted with it for a while.
+"""
+
+from enum import Enum
+from time import monotonic
+
+
+class IdleMode(Enum):
+    ACTIVE = "active"
+    THROTTLED = "throttled"
+    PAUSED = "paused"
+
+
+class IdleThrottle:
+    """
+    Chooses the animation's frame interval from how long it's been since the
+    last interaction:
+
+    - active, at the full frame rate, until throttle_after seconds pass,
+    - throttled, at a lower frame rate, until pause_after seconds pass,
+    - then paused, with no frames at all.
+
+    Any interaction goes back to the full frame rate. The time spent in each
+    mode is counted, so the saving can be measured.
+    """
+
+    def __init__(
+        self,
+        set_interval,
+        interval,
+        throttled_interval,
+        throttle_after,
+        pause_after=None,
+        version=None,
+        clock=monotonic,
+    ):
+        """
+        The set_interval function is called with the new frame interval in
+        milliseconds when the mode changes, or with None to pause. The
+        optional version function returns a value that changes with the
+        state; a change counts as an interaction. Leave pause_after as None to
+        never pause.
+        """
+        self.__set_interval = set_interval
+        self.__intervals = {
+            IdleMode.ACTIVE: interval,
+            IdleMode.THROTTLED: throttled_interval,
+            IdleMode.PAUSED: None,
+        }
+        self.__throttle_after = throttle_after
+        self.__pause_after = pause_after
+        self.__version = version
+        self.__clock = clock
+        self.__last_version = version() if version is not None else None
+        self.__last_activity = clock()
+        self.__mode_started = self.__last_activity
+        self.mode = IdleMode.ACTIVE
+        self.seconds = {mode: 0.0 for mode in IdleMode}
+        self.transitions = 0
+
+    def touch(self):
+        """Records an interaction, e.g. from a widget observer."""
+        self.__last_activity = self.__clock()
+        self.__set_mode(IdleMode.ACTIVE)
+        return self
+
+    def tick(self):
+        """Called on every frame, to notice state changes and idle time."""
+        if self.__version is not None:
+            version = self.__version()
+            if version != self.__last_version:
+                self.__last_version = version
+                self.touch()
+                return self.mode
+
+        idle = self.__clock() - self.__last_activity
+        if self.__pause_after is not None and idle >= self.__pause_after:
+            self.__set_mode(IdleMode.PAUSED)
+        elif idle >= self.__throttle_after:
+            self.__set_mode(IdleMode.THROTTLED)
+        return self.mode
+
+    def time_in_modes(self):
+        """Returns the seconds spent in each mode so far, keyed by value."""
+        seconds = dict(self.seconds)
+        seconds[self.mode] += self.__clock() - self.__mode_started
+        return {mode.value: s for mode, s in seconds.items()}
+
+    def __set_mode(self, mode):
+        if mode == self.mode:
+            return
+        now = self.__clock()
+        self.seconds[self.mode] += now - self.__mode_started
+        self.__mode_started = now
+        self.mode = mode
+        self.transitions += 1
+        self.__set_interval(self.__intervals[mode])
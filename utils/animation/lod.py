@@ -0,0 +1,72 @@
+"""
+Provides a feedback controller that lowers an animation's level of detail
+when frames take longer than their budget, and raises it again once there's
+room to spare.
+"""
+
+from collections import deque
+
+DEFAULT_WINDOW = 10
+DEFAULT_DEGRADE_ABOVE = 0.9
+DEFAULT_RESTORE_BELOW = 0.5
+
+
+class LevelOfDetail:
+    """
+    Level 0 is full detail; each higher level is cheaper to draw. The level
+    is chosen from the mean time of the last few frames, as a fraction of the
+    frame budget:
+
+    - above degrade_above, the level goes up one,
+    - below restore_below, it comes down one.
+
+    The gap between the two thresholds, and waiting for a full window of
+    frames at the new level before changing again, keep the level from
+    flickering back and forth.
+    """
+
+    def __init__(
+        self,
+        levels,
+        budget,
+        window=DEFAULT_WINDOW,
+        degrade_above=DEFAULT_DEGRADE_ABOVE,
+        restore_below=DEFAULT_RESTORE_BELOW,
+        on_change=None,
+    ):
+        """
+        The budget is in seconds. The optional on_change function is called
+        with the new level whenever it changes.
+        """
+        self.__levels = levels
+        self.__budget = budget
+        self.__times = deque(maxlen=window)
+        self.__degrade_above = degrade_above
+        self.__restore_below = restore_below
+        self.__on_change = on_change
+        self.level = 0
+        self.frames = [0] * levels
+        self.degraded = 0
+        self.restored = 0
+
+    def record(self, seconds):
+        """Records how long a frame took and returns the level to use next."""
+        self.frames[self.level] += 1
+        self.__times.append(seconds)
+        if len(self.__times) < self.__times.maxlen:
+            return self.level
+
+        load = sum(self.__times) / len(self.__times) / self.__budget
+        if load > self.__degrade_above and self.level < self.__levels - 1:
+            self.degraded += 1
+            self.__set_level(self.level + 1)
+        elif load < self.__restore_below and self.level > 0:
+            self.restored += 1
+            self.__set_level(self.level - 1)
+        return self.level
+
+    def __set_level(self, level):
+        self.level = level
+        self.__times.clear()
+        if self.__on_change is not None:
+            self.__on_change(level)
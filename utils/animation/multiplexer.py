@@ -0,0 +1,110 @@
+"""
+Provides a class that drives several animations from one timer, rather than
+each figure running its own.
+"""
+
+from itertools import count
+from time import perf_counter
+
+
+class AnimationMultiplexer:
+    """
+    On every tick of a shared timer:
+
+    1. the next frame's data is taken from each animation's frames generator,
+    2. all of the frames are calculated in one call, so the calculation can
+       be vectorised across animations, and
+    3. the figures are drawn one by one until the tick's time budget is spent.
+
+    Figures that don't fit in the budget are drawn first on the next tick, so
+    a page of slow figures staggers its draws instead of stalling the kernel.
+    Their generators aren't advanced until they're drawn: the frame data they
+    were given is calculated and drawn on the next tick, so nothing it
+    carries, e.g. a change to show, is lost.
+    """
+
+    def __init__(self, timer, calculate_batch, budget, clock=perf_counter):
+        """
+        The timer needs add_callback, start and stop, e.g. the result of a
+        matplotlib canvas's new_timer(). The calculate_batch function takes
+        a list of contexts and a list of frame data, one of each per
+        animation, and returns a list of frames. The budget is in seconds.
+        """
+        self.__timer = timer
+        self.__calculate_batch = calculate_batch
+        self.__budget = budget
+        self.__clock = clock
+        self.__ids = count()
+        self.__animations = {}
+        self.__next = 0
+        self.__timer.add_callback(self.tick)
+        self.ticks = 0
+        self.drawn = 0
+        self.deferred = 0
+
+    def __len__(self):
+        return len(self.__animations)
+
+    def add(self, figure, frames, draw, context=None):
+        """
+        Adds an animation and returns its key. The frames argument is a
+        generator function, and draw applies a calculated frame to the
+        figure's artists. The context is passed to calculate_batch with the
+        animation's frame data.
+        """
+        key = next(self.__ids)
+        self.__animations[key] = {
+            "figure": figure,
+            "frames": frames(),
+            "draw": draw,
+            "context": context,
+            "pending": None,  # The frame data of a deferred draw.
+        }
+        return key
+
+    def remove(self, key):
+        self.__animations.pop(key, None)
+        return self
+
+    def start(self):
+        self.__timer.start()
+        return self
+
+    def stop(self):
+        self.__timer.stop()
+        return self
+
+    def tick(self):
+        start = self.__clock()
+        self.ticks += 1
+        animations = list(self.__animations.values())
+        if not animations:
+            return
+
+        frames_data = [
+            next(a["frames"]) if a["pending"] is None else a["pending"]
+            for a in animations
+        ]
+        for a in animations:
+            a["pending"] = None
+        frames = self.__calculate_batch(
+            [a["context"] for a in animations],
+            frames_data,
+        )
+
+        total = len(animations)
+        first = self.__next % total
+        for j in range(total):
+            i = (first + j) % total
+            # Always draw at least one figure, however slow it is.
+            if j > 0 and self.__clock() - start > self.__budget:
+                self.deferred += total - j
+                self.__next = i
+                for k in range(j, total):
+                    deferred = (first + k) % total
+                    animations[deferred]["pending"] = frames_data[deferred]
+                return
+            animations[i]["draw"](frames[i])
+            animations[i]["figure"].canvas.draw()
+            self.drawn += 1
+        self.__next = first
@@ -0,0 +1,53 @@
+"""
+Provides a class that computes values a user is likely to ask for next on a
+background thread, so they're already cached when needed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """
+    Computes cache entries for keys on a worker thread. Each call to
+    prefetch() replaces the previous request: keys that are no longer wanted
+    and haven't started yet are cancelled.
+    """
+
+    def __init__(self, compute, cache, max_workers=1):
+        """
+        The compute function takes a key and returns its value; the cache
+        needs __contains__ and put, e.g. a ByteLRUCache.
+        """
+        self.__compute = compute
+        self.__cache = cache
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self.__pending = {}
+        self.computed = 0
+        self.cancelled = 0
+
+    def prefetch(self, keys):
+        """Queues the keys that aren't cached or already being computed."""
+        keys = list(keys)
+        for key, future in list(self.__pending.items()):
+            if future.done():
+                del self.__pending[key]
+            elif key not in keys and future.cancel():
+                del self.__pending[key]
+                self.cancelled += 1
+
+        for key in keys:
+            if key in self.__pending or key in self.__cache:
+                continue
+            self.__pending[key] = self.__executor.submit(self.__run, key)
+        return self
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+        self.__pending.clear()
+        return self
+
+    def __run(self, key):
+        self.__cache.put(key, self.__compute(key))
+        self.computed += 1
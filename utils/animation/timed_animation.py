@@ -0,0 +1,26 @@
+"""
+Provides a FuncAnimation that reports how long each frame took to produce,
+including the blit or redraw that follows the frame function.
+"""
+
+from time import perf_counter
+from matplotlib.animation import FuncAnimation
+
+
+class TimedFuncAnimation(FuncAnimation):
+    """
+    Calls on_frame with the seconds each frame took, from the start of the
+    frame function to the end of the canvas update. The time between timer
+    ticks can't show spare capacity, since a tick never comes early.
+    """
+
+    def __init__(self, *args, on_frame=None, clock=perf_counter, **kwargs):
+        self.__on_frame = on_frame
+        self.__clock = clock
+        super().__init__(*args, **kwargs)
+
+    def _draw_next_frame(self, framedata, blit):
+        start = self.__clock()
+        super()._draw_next_frame(framedata, blit)
+        if self.__on_frame is not None:
+            self.__on_frame(self.__clock() - start)
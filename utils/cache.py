@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from threading import Lock
+import numpy as np
+
+# A rough allowance for the Python objects around the arrays.
+OBJECT_OVERHEAD = 64
+
+
+def sizeof(value):
+    """Estimates the bytes held by a value, counting NumPy arrays in full and
+    walking dictionaries, lists and tuples.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes + OBJECT_OVERHEAD
+    if isinstance(value, dict):
+        return OBJECT_OVERHEAD + sum(
+            sizeof(k) + sizeof(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return OBJECT_OVERHEAD + sum(sizeof(v) for v in value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value) + OBJECT_OVERHEAD
+    return OBJECT_OVERHEAD
+
+
+class ByteLRUCache:
+    """
+    A least-recently-used cache bounded by the total size of its values
+    rather than their number. It's safe to use from several threads.
+    """
+
+    def __init__(self, max_bytes, size=sizeof):
+        self._max_bytes = max_bytes
+        self._size = size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = self._size(value)
+        if size > self._max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
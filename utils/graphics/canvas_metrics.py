@@ -0,0 +1,58 @@
+"""
+Provides a context manager that counts what ipycanvas sends to the frontend.
+"""
+
+import json
+from ipycanvas.canvas import _CANVAS_MANAGER
+
+
+class CanvasMessageCounter:
+    """
+    Counts the draw commands, widget messages and bytes sent by every canvas
+    while the context is active. Commands include property changes such as
+    fill_style, since each one is sent to the frontend. Inside hold_canvas,
+    many commands share one message.
+
+        with CanvasMessageCounter() as counter:
+            draw()
+        counter.commands, counter.messages, counter.bytes
+    """
+
+    def __init__(self, manager=_CANVAS_MANAGER):
+        self.__manager = manager
+        self.commands = 0
+        self.messages = 0
+        self.bytes = 0
+
+    def __enter__(self):
+        original_send_command = self.__manager.send_command
+        original_send = self.__manager.send
+
+        def send_command(canvas, command, buffers=[]):
+            self.commands += 1
+            return original_send_command(canvas, command, buffers)
+
+        def send(content, buffers=None):
+            self.messages += 1
+            self.bytes += len(json.dumps(content)) + sum(
+                memoryview(b).nbytes for b in buffers or []
+            )
+            return original_send(content, buffers=buffers)
+
+        self.__manager.send_command = send_command
+        self.__manager.send = send
+        return self
+
+    def __exit__(self, *args):
+        # Removing the instance attributes exposes the class's methods again.
+        del self.__manager.send_command
+        del self.__manager.send
+        return False
+
+    def as_dict(self):
+        """Returns the counts as a dictionary."""
+        return {
+            "commands": self.commands,
+            "messages": self.messages,
+            "bytes": self.bytes,
+        }
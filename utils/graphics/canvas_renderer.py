@@ -2,68 +2,176 @@
 Provides a class that contains convenience methods for a ipycanvas.
 """
 
+from contextlib import contextmanager
 from operator import itemgetter
+import numpy as np
+
+STYLE_PROPERTIES = ("fill_style", "stroke_style", "font", "filter", "line_dash")
+# The style properties each of the canvas's methods draws with.
+DRAWN_WITH = {
+    "fill_rect": ("fill_style", "filter"),
+    "fill_polygon": ("fill_style", "filter"),
+    "fill_text": ("fill_style", "font", "filter"),
+    "stroke_rect": ("stroke_style", "line_dash", "filter"),
+    "stroke_polygon": ("stroke_style", "line_dash", "filter"),
+    "stroke_line": ("stroke_style", "line_dash", "filter"),
+    "stroke_lines": ("stroke_style", "line_dash", "filter"),
+    "fill_rects": ("fill_style", "filter"),
+    "fill_polygons": ("fill_style", "filter"),
+    "stroke_rects": ("stroke_style", "line_dash", "filter"),
+    "stroke_line_segments": ("stroke_style", "line_dash", "filter"),
+    # The styled variants set each shape's color themselves.
+    "fill_styled_rects": ("filter",),
+    "fill_styled_polygons": ("filter",),
+    "stroke_styled_rects": ("line_dash", "filter"),
+    "stroke_styled_line_segments": ("line_dash", "filter"),
+}
 
 
 class CanvasRenderer:
     """
-    Convenience methods for a Canvas.
+    Convenience methods for a Canvas, or for one layer of a MultiCanvas. Each
+    renderer tracks its own canvas, so any number can be used at once.
+
+    Each call sends its commands as it's made, unless it's made inside
+    record(), which queues them and sends them as one batch at the end.
+
+    The style is tracked in Python. A style property is only sent when
+    something is drawn with it, and only when it differs from the canvas's,
+    so stashing and restoring a style around a call costs nothing when the
+    next call uses the same one.
     """
 
-    __canvas = None
-    __defaults = None
+    def __init__(self, canvas, default_canvas_settings=None):
+        self.__canvas = canvas
+        self.__defaults = default_canvas_settings
+        self.__commands = None  # A list while recording.
+        self.__style = {}  # The style as set, which the canvas catches up with.
+        self.__queued_style = {}  # The canvas's style once the queue is sent.
 
-    @classmethod
-    def set_canvas(cls, canvas):
+    @property
+    def canvas(self):
+        return self.__canvas
+
+    def set_defaults(self, default_canvas_settings):
         """
-        Applies the relevant canvas. This needs to be called before other
-        class methods.
+        Applies the canvas's defaults, which restore() can return it to.
         """
-        cls.__canvas = canvas
-        return cls
+        self.__defaults = default_canvas_settings
+        return self
 
-    @classmethod
-    def set_defaults(cls, default_canvas_settings):
+    def defaults(self):
         """
-        Applies the canvas's defaults. This needs to be called before other
-        class methods.
+        Returns the existing list of canvas defaults.
         """
-        cls.__defaults = default_canvas_settings
-        return cls
+        return self.__defaults
 
-    @classmethod
-    def defaults(cls):
+    @contextmanager
+    def record(self):
         """
-        Returns the existing list of canvas defaults.
+        Queues the draw commands and style changes made inside the context as
+        (name, arguments) pairs, and sends them in one message when it exits.
+        Recording again inside the context has no effect.
+        """
+        if self.__commands is not None:
+            yield self
+            return
+
+        self.__commands = []
+        try:
+            yield self
+        finally:
+            self.flush()
+            self.__commands = None
+
+    def flush(self):
         """
-        return cls.__defaults
+        Sends the commands queued so far, inside hold_canvas, so they're sent
+        as one message.
+        """
+        from ipycanvas import hold_canvas
+
+        if not self.__commands:
+            return self
+
+        commands, self.__commands = self.__commands, []
+        with hold_canvas():
+            for name, arguments in commands:
+                _apply(self.__canvas, name, arguments)
+        self.__queued_style = {}
+        return self
 
-    @classmethod
-    def clear(cls, dimensions=None):
+    def sync_style(self):
+        """
+        Sends any style that's been set but not yet drawn with. Call it before
+        drawing on the canvas directly rather than through these methods.
+        """
+        for name in STYLE_PROPERTIES:
+            self.__send_style(name)
+        return self
+
+    def __get_style(self, name):
+        if name in self.__style:
+            return self.__style[name]
+        return self.__canvas_style(name)
+
+    def __canvas_style(self, name):
+        # The canvas's style, once any queued commands have been sent.
+        if name in self.__queued_style:
+            return self.__queued_style[name]
+        if name == "line_dash":
+            return self.__canvas.get_line_dash()
+        return getattr(self.__canvas, name)
+
+    def __set_style(self, name, value):
+        self.__style[name] = value
+
+    def __send_style(self, name):
+        if name not in self.__style:
+            return
+        value = self.__style[name]
+        if name == "line_dash":
+            # The canvas doubles a dash pattern with an odd number of values.
+            value = list(value) * (2 if len(value) % 2 else 1)
+        if value != self.__canvas_style(name):
+            self.__send(name, value)
+
+    def __draw(self, name, *arguments):
+        for style in DRAWN_WITH.get(name, ()):
+            self.__send_style(style)
+        self.__send(name, arguments)
+
+    def __send(self, name, arguments):
+        if self.__commands is None:
+            _apply(self.__canvas, name, arguments)
+            return
+        self.__commands.append((name, arguments))
+        if name in STYLE_PROPERTIES:
+            self.__queued_style[name] = arguments
+
+    def clear(self, dimensions=None):
         """
         Clears a rectangle of the supplied dimensions. If no dimensions are
         supplied, the whole canvas is cleared.
         """
         if dimensions is None:
-            cls.__canvas.clear()
-            return cls
+            self.__draw("clear")
+            return self
 
         x, y, width, height = itemgetter("x", "y", "width", "height")(dimensions)
-        cls.__canvas.clear_rect(x, y, width, height)
-        return cls
+        self.__draw("clear_rect", x, y, width, height)
+        return self
 
-    @classmethod
-    def restore(cls, settings):
+    def restore(self, settings):
         """
         Restores a canvas to its default settings.
         """
-        cls.__canvas.font = settings["font"]
-        cls.__canvas.fill_style = settings["fill_style"]
-        cls.__canvas.stroke_style = settings["stroke_style"]
-        return cls
+        self.__set_style("font", settings["font"])
+        self.__set_style("fill_style", settings["fill_style"])
+        self.__set_style("stroke_style", settings["stroke_style"])
+        return self
 
-    @classmethod
-    def fill_rect(cls, settings):
+    def fill_rect(self, settings):
         """
         Fills a rectangle of the supplied color and dimensions. It stashes and
         restores existing canvas values.
@@ -77,14 +185,13 @@ class CanvasRenderer:
             "width",
             "height",
         )(settings)
-        original_fill_style = cls.__canvas.fill_style
-        cls.__canvas.fill_style = color
-        cls.__canvas.fill_rect(x, y, width, height)
-        cls.__canvas.fill_style = original_fill_style
-        return cls
+        original_fill_style = self.__get_style("fill_style")
+        self.__set_style("fill_style", color)
+        self.__draw("fill_rect", x, y, width, height)
+        self.__set_style("fill_style", original_fill_style)
+        return self
 
-    @classmethod
-    def stroke_rect(cls, settings):
+    def stroke_rect(self, settings):
         """
         Strokes a rectangle of the supplied color and dimensions. It stashes and
         restores existing canvas values.
@@ -94,14 +201,13 @@ class CanvasRenderer:
         color, x, y, width, height = itemgetter("color", "x", "y", "width", "height")(
             settings
         )
-        original_stroke_style = cls.__canvas.stroke_style
-        cls.__canvas.stroke_style = color
-        cls.__canvas.stroke_rect(x, y, width, height)
-        cls.__canvas.stroke_style = original_stroke_style
-        return cls
+        original_stroke_style = self.__get_style("stroke_style")
+        self.__set_style("stroke_style", color)
+        self.__draw("stroke_rect", x, y, width, height)
+        self.__set_style("stroke_style", original_stroke_style)
+        return self
 
-    @classmethod
-    def fill_polygon(cls, settings):
+    def fill_polygon(self, settings):
         """
         Fills a polygon of supplied points/vertices with the supplied color. It
         stashes and restores existing canvas values.
@@ -110,14 +216,13 @@ class CanvasRenderer:
         property is a list of two-value tuples.
         """
         color, points = itemgetter("color", "points")(settings)
-        original_fill_style = cls.__canvas.fill_style
-        cls.__canvas.fill_style = color
-        cls.__canvas.fill_polygon(points)
-        cls.__canvas.fill_style = original_fill_style
-        return cls
+        original_fill_style = self.__get_style("fill_style")
+        self.__set_style("fill_style", color)
+        self.__draw("fill_polygon", points)
+        self.__set_style("fill_style", original_fill_style)
+        return self
 
-    @classmethod
-    def stroke_polygon(cls, settings):
+    def stroke_polygon(self, settings):
         """
         Strokes a polygon of supplied points/vertices with the supplied color.
         It stashes and restores existing canvas values.
@@ -126,14 +231,13 @@ class CanvasRenderer:
         property is a list of two-value tuples.
         """
         color, points = itemgetter("color", "points")(settings)
-        original_stroke_style = cls.__canvas.stroke_style
-        cls.__canvas.stroke_style = color
-        cls.__canvas.stroke_polygon(points)
-        cls.__canvas.stroke_style = original_stroke_style
-        return cls
+        original_stroke_style = self.__get_style("stroke_style")
+        self.__set_style("stroke_style", color)
+        self.__draw("stroke_polygon", points)
+        self.__set_style("stroke_style", original_stroke_style)
+        return self
 
-    @classmethod
-    def stroke_line(cls, settings):
+    def stroke_line(self, settings):
         """
         Strokes a line with the supplied color and dash style. It stashes and
         restores existing canvas values.
@@ -144,17 +248,16 @@ class CanvasRenderer:
         color, line_dash, x1, y1, x2, y2 = itemgetter(
             "color", "line_dash", "x1", "y1", "x2", "y2"
         )(settings)
-        original_stroke_style = cls.__canvas.stroke_style
-        original_line_dash = cls.__canvas.get_line_dash()
-        cls.__canvas.stroke_style = color
-        cls.__canvas.set_line_dash(line_dash)
-        cls.__canvas.stroke_line(x1, y1, x2, y2)
-        cls.__canvas.stroke_style = original_stroke_style
-        cls.__canvas.set_line_dash(original_line_dash)
-        return cls
-
-    @classmethod
-    def stroke_lines(cls, settings):
+        original_stroke_style = self.__get_style("stroke_style")
+        original_line_dash = self.__get_style("line_dash")
+        self.__set_style("stroke_style", color)
+        self.__set_style("line_dash", line_dash)
+        self.__draw("stroke_line", x1, y1, x2, y2)
+        self.__set_style("stroke_style", original_stroke_style)
+        self.__set_style("line_dash", original_line_dash)
+        return self
+
+    def stroke_lines(self, settings):
         """
         Strokes line segments with the supplied color and dash style. It stashes
         and restores existing canvas values.
@@ -165,17 +268,105 @@ class CanvasRenderer:
         color, line_dash, line_segments = itemgetter(
             "color", "line_dash", "line_segments"
         )(settings)
-        original_stroke_style = cls.__canvas.stroke_style
-        original_line_dash = cls.__canvas.get_line_dash()
-        cls.__canvas.stroke_style = color
-        cls.__canvas.set_line_dash(line_dash)
-        cls.__canvas.stroke_lines(line_segments)
-        cls.__canvas.stroke_style = original_stroke_style
-        cls.__canvas.set_line_dash(original_line_dash)
-        return cls
-
-    @classmethod
-    def label(cls, label, settings):
+        original_stroke_style = self.__get_style("stroke_style")
+        original_line_dash = self.__get_style("line_dash")
+        self.__set_style("stroke_style", color)
+        self.__set_style("line_dash", line_dash)
+        self.__draw("stroke_lines", line_segments)
+        self.__set_style("stroke_style", original_stroke_style)
+        self.__set_style("line_dash", original_line_dash)
+        return self
+
+    def fill_rects(self, settings):
+        """
+        Fills many rectangles with one command.
+
+        The properties of the settings are "color", "x", "y", "width",
+        "height", and optionally "alpha". The coordinates are arrays with a
+        value per rectangle, or one value for all of them. The color is one
+        color, or a color per rectangle, as an (n, 3) array of RGB values or a
+        list of "#rrggbb" strings. The alpha, a value or an array, applies to
+        colors per rectangle.
+        """
+        self.__draw_many("fill_rects", "fill_style", settings, _rects(settings))
+        return self
+
+    def stroke_rects(self, settings):
+        """
+        Strokes many rectangles with one command.
+
+        The properties of the settings are as fill_rects() takes, plus an
+        optional "line_dash".
+        """
+        self.__draw_many("stroke_rects", "stroke_style", settings, _rects(settings))
+        return self
+
+    def stroke_line_segments(self, settings):
+        """
+        Strokes many lines, each through any number of points, with one
+        command.
+
+        The properties of the settings are "color", "points", and optionally
+        "points_per_line_segment", "alpha" and "line_dash". The points are an
+        (n_lines, n_points, 2) array, or an (n, 2) array with the number of
+        points in each line given by points_per_line_segment.
+        """
+        self.__draw_many(
+            "stroke_line_segments",
+            "stroke_style",
+            settings,
+            [_points(settings["points"])],
+            [settings.get("points_per_line_segment")],
+        )
+        return self
+
+    def fill_polygons(self, settings):
+        """
+        Fills many polygons with one command.
+
+        The properties of the settings are "color", "points", and optionally
+        "points_per_polygon" and "alpha". The points are an (n_polygons,
+        n_points, 2) array, or an (n, 2) array with the number of points in
+        each polygon given by points_per_polygon.
+        """
+        self.__draw_many(
+            "fill_polygons",
+            "fill_style",
+            settings,
+            [_points(settings["points"])],
+            [settings.get("points_per_polygon")],
+        )
+        return self
+
+    def __draw_many(self, name, style, settings, shapes, options=()):
+        # One color goes through the style, like the methods that draw one
+        # shape. A color per shape goes through the styled variant of the
+        # canvas's method, which takes (shapes, colors, alpha, options).
+        color = settings["color"]
+        line_dash = settings.get("line_dash")
+        if line_dash is not None:
+            original_line_dash = self.__get_style("line_dash")
+            self.__set_style("line_dash", line_dash)
+
+        if isinstance(color, str):
+            original_style = self.__get_style(style)
+            self.__set_style(style, color)
+            self.__draw(name, *shapes, *options)
+            self.__set_style(style, original_style)
+        else:
+            alpha = settings.get("alpha", 1)
+            self.__draw(
+                name.replace("_", "_styled_", 1),
+                *shapes,
+                _colors(color),
+                alpha if np.isscalar(alpha) else np.asarray(alpha, dtype=np.float32),
+                *options,
+            )
+
+        if line_dash is not None:
+            self.__set_style("line_dash", original_line_dash)
+
+    def label(self, label, settings):
         """
         Draws a label with the supplied settings. It stashes and restores
         existing canvas values.
@@ -188,15 +379,99 @@ class CanvasRenderer:
         font, font_color, flter = itemgetter("font", "font_color", "filter")(settings)
         text, x, y = itemgetter("text", "x", "y")(label)
 
-        original_fill_style = cls.__canvas.fill_style
-        original_font = cls.__canvas.font
-        original_filter = cls.__canvas.filter
-        cls.__canvas.font = font
-        cls.__canvas.fill_style = font_color
-        cls.__canvas.filter = flter
-        cls.__canvas.fill_text(text, x, y)
-        cls.__canvas.fill_style = original_fill_style
-        cls.__canvas.font = original_font
-        cls.__canvas.filter = original_filter
-
-        return cls
+        original_fill_style = self.__get_style("fill_style")
+        original_font = self.__get_style("font")
+        original_filter = self.__get_style("filter")
+        self.__set_style("font", font)
+        self.__set_style("fill_style", font_color)
+        self.__set_style("filter", flter)
+        self.__draw("fill_text", text, x, y)
+        self.__set_style("fill_style", original_fill_style)
+        self.__set_style("font", original_font)
+        self.__set_style("filter", original_filter)
+
+        return self
+
+
+class LayeredRenderer:
+    """
+    A CanvasRenderer for each layer of a MultiCanvas, bottom first. A static
+    layer is drawn once; the others are cleared and redrawn on their own,
+    leaving the layers above and below them as they are.
+    """
+
+    def __init__(self, multi_canvas, count, default_canvas_settings=None):
+        """The count is the number of layers the MultiCanvas was created with."""
+        self.canvas = multi_canvas
+        self.layers = [
+            CanvasRenderer(multi_canvas[i], default_canvas_settings)
+            for i in range(count)
+        ]
+        self.__drawn = set()
+
+    def __getitem__(self, index):
+        return self.layers[index]
+
+    def __len__(self):
+        return len(self.layers)
+
+    def draw_static(self, index, draw):
+        """
+        Draws a layer by calling draw with its renderer, the first time it's
+        called for the layer only.
+        """
+        if index not in self.__drawn:
+            with self.layers[index].record() as renderer:
+                draw(renderer)
+            self.__drawn.add(index)
+        return self
+
+    def redraw(self, index, draw):
+        """
+        Clears a layer and draws it again by calling draw with its renderer,
+        in one message.
+        """
+        with self.layers[index].record() as renderer:
+            renderer.clear()
+            draw(renderer)
+        return self
+
+
+def _coordinates(values):
+    # Arrays are sent as binary buffers, rather than as JSON like lists are.
+    # Single precision is plenty for pixels, and half the bytes.
+    if np.isscalar(values):
+        return values
+    return np.asarray(values, dtype=np.float32)
+
+
+def _points(points):
+    # Shapes with different numbers of points come as a list of arrays.
+    try:
+        return np.asarray(points, dtype=np.float32)
+    except ValueError:
+        return [np.asarray(p, dtype=np.float32) for p in points]
+
+
+def _rects(settings):
+    return [_coordinates(settings[k]) for k in ("x", "y", "width", "height")]
+
+
+def _colors(colors):
+    # The styled methods take an (n, 3) array of RGB values.
+    if len(colors) and isinstance(colors[0], str):
+        return np.array(
+            [[int(c[i : i + 2], 16) for i in (1, 3, 5)] for c in colors],
+            dtype=np.uint8,
+        )
+    return np.asarray(colors, dtype=np.uint8)
+
+
+def _apply(canvas, name, arguments):
+    # Style properties take a value, and the rest of the commands arguments.
+    if name == "line_dash":
+        canvas.set_line_dash(arguments)
+    elif name in STYLE_PROPERTIES:
+        setattr(canvas, name, arguments)
+    else:
+        getattr(canvas, name)(*arguments)
@@ -0,0 +1,18 @@
+"""
+Provides a stand-in for pyplot's subplots() that creates figures outside of
+pyplot's state machine. The figures render with Agg and are safe to draw on a
+background thread while an interactive figure keeps running.
+
+Functions that take pyplot as an argument (e.g. define_plot(plt)) can be given
+this module instead.
+"""
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def subplots(*args, **kwargs):
+    """Returns a (figure, axes) pair, like pyplot.subplots()."""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(*args, **kwargs)
@@ -0,0 +1,224 @@
+"""
+Provides a canvas that draws into an image rather than a browser, so what a
+CanvasRenderer draws can be tested and exported to PNG without a frontend.
+"""
+
+from functools import lru_cache
+import re
+import numpy as np
+
+DEFAULT_FONT = "12px serif"
+DEFAULT_BACKGROUND = "#ffffff"
+FONT_SIZE = re.compile(r"(\d+(?:\.\d+)?)px")
+
+
+class RasterCanvas:
+    """
+    Stands in for an ipycanvas Canvas, with the properties and methods a
+    CanvasRenderer uses, and draws with Pillow into an RGB image:
+
+        renderer = CanvasRenderer(RasterCanvas(width=400, height=300))
+        RenderUtils(renderer).a_rect()
+        renderer.canvas.save("a_rect.png")
+
+    Fill and stroke styles take any color Pillow does, e.g. "#rrggbb" or
+    "black". Dashes follow the line dash, restarting with each path as a
+    canvas's do. Text is drawn on its alphabetic baseline, with the size and
+    family in the font, e.g. "bold 14px serif", found through matplotlib's
+    font manager.
+
+    It isn't a browser: shapes aren't anti-aliased or sketched like a
+    RoughCanvas's, filters aren't applied, and cleared pixels are set to the
+    background color rather than made transparent.
+    """
+
+    def __init__(self, width=700, height=500, background=DEFAULT_BACKGROUND):
+        from PIL import Image, ImageDraw
+
+        self.width = width
+        self.height = height
+        self.background = background
+        self.fill_style = "black"
+        self.stroke_style = "black"
+        self.font = DEFAULT_FONT
+        self.filter = "none"
+        self.line_width = 1
+        self.__line_dash = []
+        self.__image = Image.new("RGB", (width, height), background)
+        # Drawing in RGBA onto an RGB image blends colors with an alpha.
+        self.__draw = ImageDraw.Draw(self.__image, "RGBA")
+
+    def get_line_dash(self):
+        return list(self.__line_dash)
+
+    def set_line_dash(self, segments):
+        # As a canvas does, a pattern with an odd number of values is doubled.
+        segments = list(segments)
+        self.__line_dash = segments * (2 if len(segments) % 2 else 1)
+
+    def to_image(self):
+        """Returns a copy of the image drawn so far."""
+        return self.__image.copy()
+
+    def to_array(self):
+        """Returns the pixels drawn so far, as a (height, width, 3) array."""
+        return np.asarray(self.__image)
+
+    def save(self, path):
+        """Writes the image drawn so far to a file, e.g. a PNG."""
+        self.__image.save(path)
+        return self
+
+    def clear(self):
+        self.clear_rect(0, 0, self.width, self.height)
+
+    def clear_rect(self, x, y, width, height):
+        self.__draw.rectangle(_box(x, y, width, height), fill=self.background)
+
+    def fill_rect(self, x, y, width, height):
+        self.__draw.rectangle(_box(x, y, width, height), fill=self.fill_style)
+
+    def stroke_rect(self, x, y, width, height):
+        self.__stroke(_corners(x, y, width, height), self.stroke_style, closed=True)
+
+    def fill_polygon(self, points):
+        self.__draw.polygon(_xy(points), fill=self.fill_style)
+
+    def stroke_polygon(self, points):
+        self.__stroke(points, self.stroke_style, closed=True)
+
+    def stroke_line(self, x1, y1, x2, y2):
+        self.__stroke([(x1, y1), (x2, y2)], self.stroke_style)
+
+    def stroke_lines(self, points):
+        self.__stroke(points, self.stroke_style)
+
+    def fill_text(self, text, x, y, max_width=None):
+        self.__draw.text(
+            (x, y), text, fill=self.fill_style, font=_font(self.font), anchor="ls"
+        )
+
+    def fill_rects(self, x, y, width, height):
+        for rect in _rects(x, y, width, height):
+            self.fill_rect(*rect)
+
+    def stroke_rects(self, x, y, width, height):
+        for rect in _rects(x, y, width, height):
+            self.stroke_rect(*rect)
+
+    def fill_polygons(self, points, points_per_polygon=None):
+        for polygon in _shapes(points, points_per_polygon):
+            self.fill_polygon(polygon)
+
+    def stroke_line_segments(self, points, points_per_line_segment=None):
+        for line in _shapes(points, points_per_line_segment):
+            self.stroke_lines(line)
+
+    def fill_styled_rects(self, x, y, width, height, color, alpha=1):
+        rects = _rects(x, y, width, height)
+        for rect, fill in zip(rects, _rgba(color, alpha, len(rects))):
+            self.__draw.rectangle(_box(*rect), fill=fill)
+
+    def stroke_styled_rects(self, x, y, width, height, color, alpha=1):
+        rects = _rects(x, y, width, height)
+        for rect, stroke in zip(rects, _rgba(color, alpha, len(rects))):
+            self.__stroke(_corners(*rect), stroke, closed=True)
+
+    def fill_styled_polygons(self, points, color, alpha=1, points_per_polygon=None):
+        polygons = _shapes(points, points_per_polygon)
+        for polygon, fill in zip(polygons, _rgba(color, alpha, len(polygons))):
+            self.__draw.polygon(_xy(polygon), fill=fill)
+
+    def stroke_styled_line_segments(
+        self, points, color, alpha=1, points_per_line_segment=None
+    ):
+        lines = _shapes(points, points_per_line_segment)
+        for line, stroke in zip(lines, _rgba(color, alpha, len(lines))):
+            self.__stroke(line, stroke)
+
+    def __stroke(self, points, color, closed=False):
+        points = _xy(points)
+        if closed:
+            points.append(points[0])
+        width = max(1, round(self.line_width))
+        for dash in _dashes(points, self.__line_dash):
+            self.__draw.line(dash, fill=color, width=width)
+
+
+def _box(x, y, width, height):
+    # A canvas fills the pixels from x up to x + width; Pillow includes both.
+    x0, x1 = sorted((x, x + width))
+    y0, y1 = sorted((y, y + height))
+    return [x0, y0, max(x0, x1 - 1), max(y0, y1 - 1)]
+
+
+def _corners(x, y, width, height):
+    return [(x, y), (x + width, y), (x + width, y + height), (x, y + height)]
+
+
+def _xy(points):
+    return [(float(x), float(y)) for x, y in points]
+
+
+def _rects(x, y, width, height):
+    # A value for all of the rectangles, or one per rectangle.
+    return list(zip(*np.broadcast_arrays(*np.atleast_1d(x, y, width, height))))
+
+
+def _shapes(points, points_per_shape):
+    if points_per_shape is None:
+        return list(points)
+    ends = np.cumsum(points_per_shape)[:-1]
+    return np.split(np.asarray(points), ends)
+
+
+def _rgba(colors, alpha, count):
+    alphas = np.broadcast_to(np.round(np.asarray(alpha) * 255), (count,))
+    return [(*map(int, rgb), int(a)) for rgb, a in zip(np.asarray(colors), alphas)]
+
+
+def _dashes(points, pattern):
+    """
+    Splits a line through points into the runs a dash pattern draws, as lists
+    of points. With no pattern, the line is drawn whole.
+    """
+    if not pattern or not any(pattern):
+        return [points]
+
+    dashes = []
+    index, left, on = 0, pattern[0], True
+    current = [points[0]]
+    for start, end in zip(points, points[1:]):
+        start, end = np.asarray(start), np.asarray(end)
+        length = float(np.hypot(*(end - start)))
+        done = 0.0
+        while length - done > left:
+            done += left
+            point = tuple(start + (end - start) * (done / length))
+            if on:
+                dashes.append(current + [point])
+            current = [point]
+            index = (index + 1) % len(pattern)
+            left, on = pattern[index], not on
+        left -= length - done
+        current.append(tuple(end))
+    if on and len(current) > 1:
+        dashes.append(current)
+    return dashes
+
+
+@lru_cache(maxsize=None)
+def _font(font):
+    # A CSS font, e.g. "bold 14px serif": the size in pixels, then the family.
+    from matplotlib.font_manager import FontProperties, findfont
+    from PIL import ImageFont
+
+    match = FONT_SIZE.search(font)
+    size = float(match.group(1)) if match else 10
+    family = font[match.end() :].strip() if match else "serif"
+    properties = FontProperties(
+        family=[f.strip(" \"'") for f in family.split(",")],
+        weight="bold" if "bold" in font.split() else "normal",
+        style="italic" if "italic" in font.split() else "normal",
+    )
+    return ImageFont.truetype(findfont(properties), size)
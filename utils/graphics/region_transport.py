@@ -0,0 +1,176 @@
+"""
+Provides a way to show an animated matplotlib figure in the browser that sends
+only the part of each frame that changed.
+
+ipympl sends the whole figure as a PNG for every frame. Here the figure is
+rendered offscreen with Agg, the animated artists are blitted over a saved
+background, and only the pixels inside the union of their bounding boxes
+(this frame's and the last's, so old positions get erased) are encoded and
+sent to an ipycanvas Canvas.
+"""
+
+from collections import deque
+from time import perf_counter
+import numpy as np
+from ipycanvas import Canvas
+from ipycanvas.utils import binary_image
+
+try:
+    from ipycanvas.canvas import COMMANDS
+except ImportError:
+    COMMANDS = {}
+
+DEFAULT_QUALITY = 75
+REGION_PADDING = 2  # Pixels, for antialiasing at the edge of an artist.
+RATE_WINDOW = 1.0  # Seconds.
+
+
+class RegionTransport:
+    """
+    Sends frames of an offscreen (Agg) figure to a Canvas.
+
+    The scale renders the figure at a fraction of its resolution, which the
+    browser scales back up. PNG is lossless; JPEG drops the alpha channel
+    and is lossy, to a degree set by the quality (1 to 95).
+    """
+
+    def __init__(
+        self,
+        figure,
+        artists,
+        scale=1.0,
+        image_format="png",
+        quality=DEFAULT_QUALITY,
+        clock=perf_counter,
+    ):
+        if image_format not in ("png", "jpeg"):
+            raise ValueError("The image format should be png or jpeg.")
+        self.__figure = figure
+        self.__artists = list(artists)
+        self.__image_format = image_format
+        self.__quality = quality
+        self.__clock = clock
+        self.__background = None
+        self.__previous_region = None
+        self.__sent = deque()
+
+        width, height = figure.canvas.get_width_height()
+        figure.set_dpi(figure.dpi * scale)
+        for artist in self.__artists:
+            artist.set_animated(True)
+
+        scaled_width, scaled_height = figure.canvas.get_width_height()
+        self.canvas = Canvas(width=scaled_width, height=scaled_height)
+        self.canvas.layout.width = f"{width}px"
+        self.canvas.layout.height = f"{height}px"
+
+        self.frames = 0
+        self.full_frames = 0
+        self.bytes_sent = 0
+
+    def render(self, full=False):
+        """
+        Draws the animated artists and sends what changed. A full render
+        redraws the background too, e.g. after the title changes.
+        """
+        figure_canvas = self.__figure.canvas
+        if full or self.__background is None:
+            figure_canvas.draw()
+            self.__background = figure_canvas.copy_from_bbox(self.__figure.bbox)
+            self.__draw_artists()
+            self.full_frames += 1
+            region = (0, 0) + figure_canvas.get_width_height()
+        else:
+            figure_canvas.restore_region(self.__background)
+            region = self.__draw_artists()
+
+        self.__send(region)
+        self.frames += 1
+        return self
+
+    def bytes_per_second(self):
+        """The bytes sent over the last RATE_WINDOW seconds, per second."""
+        since = self.__clock() - RATE_WINDOW
+        return sum(n for t, n in self.__sent if t >= since) / RATE_WINDOW
+
+    def as_dict(self):
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "bytes_sent": self.bytes_sent,
+            "bytes_per_frame": self.bytes_sent / self.frames if self.frames else 0,
+            "bytes_per_second": self.bytes_per_second(),
+        }
+
+    def __draw_artists(self):
+        # Returns the union of the artists' boxes, and the previous frame's,
+        # as (x, y, width, height) in pixels from the top left.
+        renderer = self.__figure.canvas.get_renderer()
+        boxes = []
+        for artist in self.__artists:
+            self.__figure.draw_artist(artist)
+            extents = artist.get_window_extent(renderer).extents
+            # An artist without any data has an infinite or empty box.
+            if artist.get_visible() and np.all(np.isfinite(extents)):
+                # Boxes don't include the width of the line drawn around them.
+                line_width = getattr(artist, "get_linewidth", lambda: 0)()
+                pad = line_width * self.__figure.dpi / 72 / 2
+                boxes.append(extents + np.array([-pad, -pad, pad, pad]))
+
+        width, height = self.__figure.canvas.get_width_height()
+        region = None
+        if boxes:
+            x0, y0 = np.min(boxes, axis=0)[:2]
+            x1, y1 = np.max(boxes, axis=0)[2:]
+            left = int(max(0, np.floor(x0) - REGION_PADDING))
+            right = int(min(width, np.ceil(x1) + REGION_PADDING))
+            top = int(max(0, height - np.ceil(y1) - REGION_PADDING))
+            bottom = int(min(height, height - np.floor(y0) + REGION_PADDING))
+            region = (left, top, max(0, right - left), max(0, bottom - top))
+
+        changed = _union(region, self.__previous_region)
+        self.__previous_region = region
+        return changed
+
+    def __send(self, region):
+        if region is None or region[2] == 0 or region[3] == 0:
+            return
+        x, y, width, height = region
+        pixels = np.asarray(self.__figure.canvas.buffer_rgba())
+        pixels = pixels[y : y + height, x : x + width]
+        if self.__image_format == "jpeg":
+            pixels = pixels[..., :3]
+        image = binary_image(pixels, quality=self.__quality)
+        _put_image(self.canvas, image, pixels, x, y)
+        self.bytes_sent += len(image)
+        now = self.__clock()
+        self.__sent.append((now, len(image)))
+        while self.__sent and self.__sent[0][0] < now - RATE_WINDOW:
+            self.__sent.popleft()
+
+
+def _put_image(canvas, image, pixels, x, y):
+    """
+    Sends an encoded image to the canvas at (x, y). put_image_data() can't
+    take an image that's already encoded, so this sends the same command it
+    does, through the canvas's manager, which ipycanvas 0.13 has. With any
+    other version, where that isn't there, it falls back to put_image_data()
+    with the pixels, which encodes them at ipycanvas's default quality.
+    """
+    manager = getattr(canvas, "_canvas_manager", None)
+    if manager is None or "putImageData" not in COMMANDS:
+        canvas.put_image_data(pixels, x, y)
+        return
+    manager.send_draw_command(canvas, COMMANDS["putImageData"], [x, y], [image])
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    left = min(a[0], b[0])
+    top = min(a[1], b[1])
+    right = max(a[0] + a[2], b[0] + b[2])
+    bottom = max(a[1] + a[3], b[1] + b[3])
+    return (left, top, right - left, bottom - top)
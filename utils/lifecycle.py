@@ -0,0 +1,107 @@
+"""
+Keeps track of the figures, timers, threads and widgets a notebook cell
+creates, so that running the cell again can dispose of the previous run's
+before creating its own.
+"""
+
+import gc
+import weakref
+
+_lifecycles = {}
+
+
+class Lifecycle:
+    """
+    The resources created by one run of a cell. Each resource is tracked with
+    a function that disposes of it; dispose() calls them in the reverse of the
+    order they were tracked, once each.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.__resources = []
+        self.__disposed = []
+
+    def __len__(self):
+        return len(self.__resources)
+
+    def track(self, resource, dispose):
+        """Tracks a resource and returns it, so calls can be inlined."""
+        self.__resources.append((_reference(resource), dispose))
+        return resource
+
+    def figure(self, figure):
+        def dispose(fig):
+            import matplotlib.pyplot as plt
+
+            plt.close(fig)
+
+        return self.track(figure, dispose)
+
+    def animation(self, animation):
+        """Stops a matplotlib animation's timer."""
+
+        def dispose(ani):
+            if ani.event_source is not None:
+                ani.event_source.stop()
+
+        return self.track(animation, dispose)
+
+    def stoppable(self, resource):
+        """Tracks anything with a stop() method, e.g. a timer or a thread."""
+        return self.track(resource, lambda r: r.stop())
+
+    def widget(self, widget):
+        """Closes the widget and every widget it holds when disposed."""
+        return self.track(widget, close_widget)
+
+    def dispose(self):
+        """Disposes of the resources that are still alive."""
+        resources, self.__resources = self.__resources, []
+        for reference, dispose in reversed(resources):
+            resource = reference()
+            if resource is not None:
+                dispose(resource)
+        self.__disposed.extend(reference for reference, _ in resources)
+        return self
+
+    def leaks(self):
+        """
+        Returns the resources that are still referenced after being disposed
+        of. Anything here is being kept alive by something outside the cell.
+        """
+        gc.collect()
+        resources = (reference() for reference in self.__disposed)
+        return [r for r in resources if r is not None]
+
+
+def _reference(resource):
+    try:
+        return weakref.ref(resource)
+    except TypeError:
+        return lambda: resource
+
+
+def close_widget(widget):
+    """Closes a widget, its layout and style, and its children."""
+    from ipywidgets import Widget
+
+    for name in widget.keys:
+        value = getattr(widget, name, None)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if isinstance(v, Widget) and v is not widget:
+                close_widget(v)
+    widget.close()
+
+
+def begin(name):
+    """
+    Starts a new run of the cell called name, disposing of the resources of
+    its previous run. Returns the Lifecycle to track the new run's resources.
+    """
+    previous = _lifecycles.pop(name, None)
+    if previous is not None:
+        previous.dispose()
+    _lifecycles[name] = Lifecycle(name)
+    return _lifecycles[name]
@@ -0,0 +1,75 @@
+"""
+Provides supporting entry points for "A Circle and Its Sinosoidal Wave".
+
+The notebook's code lives in the top-level `03_circle_sinosoidal.py` module.
+Its name isn't a valid identifier, so it's loaded by name rather than with an
+import statement.
+"""
+
+from importlib import import_module
+from utils.state import State
+
+NOTEBOOK_MODULE_NAME = "03_circle_sinosoidal"
+
+# Keyed by the values of the notebook's StateProp enum, so parameters can be
+# passed to worker processes and parsed from the command line.
+DEFAULT_PARAMETERS = {
+    "trig_function": "Sine",
+    "phase_shift": 0,
+    "vertical_shift": 0,
+    "horizontal_scalar": 1,
+    "vertical_scalar": 1,
+}
+PARAMETER_FLAGS = {
+    "trig_function": "--trig-function",
+    "phase_shift": "--phase",
+    "vertical_shift": "--vertical-shift",
+    "horizontal_scalar": "--frequency",
+    "vertical_scalar": "--amplitude",
+}
+
+
+def load_notebook():
+    """Returns the notebook's module. Importing it has no side effects; the
+    state, UI and animation are only set up when it runs as __main__.
+    """
+    return import_module(NOTEBOOK_MODULE_NAME)
+
+
+def use_agg():
+    """Switches matplotlib to the Agg backend. Used to initialize workers."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def define_state(notebook, parameters=None):
+    """Returns a State holding the default parameters, updated with any that
+    are supplied.
+    """
+    values = DEFAULT_PARAMETERS | (parameters or {})
+    return State(
+        {notebook.StateProp.MODIFIED: False}
+        | {notebook.StateProp(k): v for k, v in values.items()}
+    )
+
+
+def add_parameter_arguments(parser, nargs=None):
+    """Adds a command-line flag for each parameter. With nargs="+", each flag
+    takes a list of values.
+    """
+    for key, flag in PARAMETER_FLAGS.items():
+        default = DEFAULT_PARAMETERS[key]
+        parser.add_argument(
+            flag,
+            dest=key,
+            nargs=nargs,
+            type=str if isinstance(default, str) else float,
+            default=[default] if nargs else default,
+        )
+    return parser
+
+
+def parameters_from_arguments(options):
+    """Returns the parameters from parsed command-line arguments."""
+    return {key: getattr(options, key) for key in PARAMETER_FLAGS}
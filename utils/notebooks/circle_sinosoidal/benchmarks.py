@@ -0,0 +1,262 @@
+"""
+Benchmarks for "A Circle and Its Sinosoidal Wave". Run them with:
+
+    python -m utils.notebooks.circle_sinosoidal.benchmarks
+
+Each benchmark returns a dictionary of results; main() prints them as JSON.
+"""
+
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO
+import json
+from operator import itemgetter
+from pathlib import Path
+import runpy
+import subprocess
+import sys
+import threading
+from time import perf_counter
+from . import NOTEBOOK_MODULE_NAME, define_state, load_notebook, use_agg
+
+BENCHMARK_FRAMES = 200
+TRANSPORT_SETTINGS = [
+    {"scale": 1.0, "image_format": "png"},
+    {"scale": 1.0, "image_format": "jpeg", "quality": 75},
+    {"scale": 0.5, "image_format": "png"},
+    {"scale": 0.5, "image_format": "jpeg", "quality": 50},
+]
+LIFECYCLE_RUNS = 5
+# This module by name, since run with -m, its __name__ is "__main__".
+IMPORT_TIME_MODULES = [
+    NOTEBOOK_MODULE_NAME,
+    "utils.notebooks.circle_sinosoidal.benchmarks",
+]
+# Modules that importing the notebook's helpers shouldn't need.
+HEAVY_MODULES = ["matplotlib.pyplot", "ipywidgets", "ipycanvas", "IPython"]
+
+
+def _frames(notebook, state, count):
+    frames = notebook.generate_frames(state)()
+    return [next(frames) for _ in range(count)]
+
+
+def _rate(count, seconds):
+    return count / seconds if seconds else float("inf")
+
+
+def benchmark_backends(count=BENCHMARK_FRAMES):
+    """
+    Compares bytes per frame and achievable frames per second for the
+    matplotlib and ipycanvas backends.
+
+    The matplotlib figure is rasterised with Agg and encoded as a PNG, which
+    is what ipympl sends for each frame. The canvas backend is measured by the
+    draw commands it sends. Neither includes the time the browser takes to
+    paint the frame.
+    """
+    use_agg()
+    import matplotlib.pyplot as plt
+    from utils.graphics.canvas_metrics import CanvasMessageCounter
+
+    notebook = load_notebook()
+
+    state = define_state(notebook)
+    frames = _frames(notebook, state, count)
+    fig, animated_parts = itemgetter(
+        notebook.PlotPart.FIG,
+        notebook.PlotPart.ANIMATED_PARTS,
+    )(notebook.define_plot(plt))
+    animate = notebook.animate(animated_parts, state)
+    png_bytes = 0
+    start = perf_counter()
+    for frame_data in frames:
+        animate(frame_data)
+        buffer = BytesIO()
+        fig.canvas.print_png(buffer)
+        png_bytes += buffer.tell()
+    matplotlib_seconds = perf_counter() - start
+    plt.close(fig)
+
+    state = define_state(notebook)
+    frames = _frames(notebook, state, count)
+    calculate = notebook.calculate_frame(state)
+    draw = notebook.draw_canvas_frame(notebook.define_canvas())
+    with CanvasMessageCounter() as counter:
+        start = perf_counter()
+        for frame_data in frames:
+            draw(calculate(frame_data))
+        canvas_seconds = perf_counter() - start
+
+    return {
+        "frames": count,
+        "matplotlib": {
+            "bytes_per_frame": png_bytes / count,
+            "fps": _rate(count, matplotlib_seconds),
+        },
+        "canvas": {
+            "bytes_per_frame": counter.bytes / count,
+            "commands_per_frame": counter.commands / count,
+            "fps": _rate(count, canvas_seconds),
+        },
+    }
+
+
+def benchmark_transport(count=BENCHMARK_FRAMES, settings=TRANSPORT_SETTINGS):
+    """
+    Measures bytes per frame and frames per second for the regions backend,
+    which sends only the changed part of each frame, at a few scales and
+    encodings. Compare with the matplotlib figures from benchmark_backends.
+    """
+    from utils.graphics import offscreen
+    from utils.graphics.region_transport import RegionTransport
+
+    notebook = load_notebook()
+    results = []
+    for setting in settings:
+        state = define_state(notebook)
+        frames = _frames(notebook, state, count)
+        fig, animated_parts = itemgetter(
+            notebook.PlotPart.FIG,
+            notebook.PlotPart.ANIMATED_PARTS,
+        )(notebook.define_plot(offscreen))
+        artists = [
+            v
+            for k, v in animated_parts.items()
+            if k != notebook.AnimatedPart.FULL_WAVE
+        ]
+        transport = RegionTransport(fig, artists, **setting)
+        calculate = notebook.calculate_frame(state)
+        draw = notebook.draw_transport_frame(transport, animated_parts)
+
+        start = perf_counter()
+        for frame_data in frames:
+            draw(calculate(frame_data))
+        seconds = perf_counter() - start
+
+        results.append(
+            setting
+            | {
+                "bytes_per_frame": transport.bytes_sent / count,
+                "full_frames": transport.full_frames,
+                "fps": _rate(count, seconds),
+            }
+        )
+    return {"frames": count, "settings": results}
+
+
+def _import_times(module):
+    # Runs a fresh interpreter with -X importtime, which reports the self and
+    # cumulative microseconds of each import on stderr. Only imports made
+    # through __import__ are reported, not those by importlib.import_module.
+    root = Path(__file__).resolve().parents[3]
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"__import__({module!r})"],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def benchmark_import_time(modules=IMPORT_TIME_MODULES):
+    """
+    Measures how long importing the notebook module, and this one, takes in
+    a fresh interpreter, using -X importtime, and which heavy modules come in
+    with them. numpy is reported separately, since the helpers need it.
+    """
+    results = {}
+    for module in modules:
+        times = _import_times(module)
+        results[module] = {
+            "milliseconds": times.get(module, 0) / 1000,
+            "numpy_milliseconds": times.get("numpy", 0) / 1000,
+            "heavy_modules": [m for m in HEAVY_MODULES if m in times],
+        }
+    return results
+
+
+def check_lifecycle(runs=LIFECYCLE_RUNS):
+    """
+    Runs the notebook's cell several times over, as re-executing it in
+    Jupyter does, and counts the open figures, widgets and threads after each
+    run. The counts should stay flat. The leaks are the previous run's
+    resources that are still referenced once the next run has replaced them.
+    """
+    use_agg()
+    import matplotlib.pyplot as plt
+    from ipywidgets.widgets.widget import _instances as widgets
+
+    path = load_notebook().__file__
+    counts = []
+    leaks = []
+    previous = None
+    for _ in range(runs):
+        # Outside IPython, display() prints the widgets' reprs, which would
+        # end up in main()'s JSON.
+        with redirect_stdout(StringIO()):
+            run = runpy.run_path(path, run_name="__main__")
+        resources = run["notebook"]["resources"]
+        if previous is not None:
+            leaks.extend(type(r).__name__ for r in previous.leaks())
+        previous = resources
+        counts.append(
+            {
+                "figures": len(plt.get_fignums()),
+                "widgets": len(widgets),
+                "threads": threading.active_count(),
+            }
+        )
+
+    return {
+        "runs": counts,
+        "leaks": leaks,
+        "leak_free": not leaks and all(c == counts[0] for c in counts),
+    }
+
+
+def check_dependency_graph():
+    """
+    Calculates a frame, then the same frame with the other trig function, and
+    counts the derived values the toggle recalculated. The circle is worked
+    out from the step alone, so it shouldn't be among them.
+    """
+    notebook = load_notebook()
+    StateProp, ToggleButtonOption = notebook.StateProp, notebook.ToggleButtonOption
+
+    graph = notebook.define_dependency_graph()
+    current_state = define_state(notebook).get_all()
+    x = notebook.ANIMATION_FRAME_STEP_FACTOR
+    notebook.calculate_graph_parts(graph, current_state, x)
+    before = graph.recomputed.copy()
+    toggled = current_state | {StateProp.TRIG_FUNCTION: ToggleButtonOption.COSINE}
+    notebook.calculate_graph_parts(graph, toggled, x)
+    recomputed = graph.recomputed - before
+
+    return {
+        "recomputed": {name.value: count for name, count in recomputed.items()},
+        "circle_kept": not recomputed[notebook.DerivedValue.CIRCLE],
+    }
+
+
+BENCHMARKS = {
+    "backends": benchmark_backends,
+    "transport": benchmark_transport,
+    "lifecycle": check_lifecycle,
+    "dependency_graph": check_dependency_graph,
+    "import_time": benchmark_import_time,
+}
+
+
+def main():
+    print(json.dumps({k: fn() for k, fn in BENCHMARKS.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
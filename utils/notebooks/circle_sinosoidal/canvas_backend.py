@@ -0,0 +1,122 @@
+"""
+Provides an ipycanvas rendering backend for "A Circle and Its Sinosoidal Wave".
+
+Instead of rasterising the figure and shipping a PNG for every frame, as
+matplotlib/ipympl does, the axes, circle, waves and arms are sent as vector
+draw commands. Wave geometry goes over the wire as binary NumPy buffers.
+"""
+
+import numpy as np
+from ipycanvas import Canvas, hold_canvas
+
+DEFAULT_WIDTH = 640
+TITLE_HEIGHT = 40
+TITLE_FONT = "13px sans-serif"
+POINT_RADIUS = 3
+POINTS_PER_INCH = 72  # Matplotlib line widths are in points.
+
+
+class SinusoidCanvas:
+    """
+    Draws the notebook's animated parts to a Canvas.
+
+    The parts are supplied as a dictionary keyed by part name ("full_wave",
+    "period_wave", "point", "circle", "theta_circle", "terminal_arm",
+    "connecting_arm"), with the same values the matplotlib update functions
+    take. Coordinates are in plot units and mapped to pixels here.
+    """
+
+    def __init__(self, bounds, styles, dpi, width=DEFAULT_WIDTH):
+        """
+        The bounds are (min_x, max_x, min_y, max_y) in plot units. The styles
+        map each part name, plus "axes" and "title", to a dictionary with
+        "color" and, for lines, "line_width" in points. The dpi is the
+        figure's, which line widths are converted to pixels with.
+        """
+        self.__min_x, self.__max_x, self.__min_y, self.__max_y = bounds
+        self.__styles = styles
+        self.__pixels_per_point = dpi / POINTS_PER_INCH
+        self.__scale = width / (self.__max_x - self.__min_x)
+        self.__title = ""
+        self.canvas = Canvas(
+            width=width,
+            height=TITLE_HEIGHT
+            + int(round((self.__max_y - self.__min_y) * self.__scale)),
+        )
+
+    def to_pixels(self, xs, ys):
+        """Maps plot coordinates to an (n, 2) array of canvas pixels."""
+        xs = (np.asarray(xs, dtype=np.float32) - self.__min_x) * self.__scale
+        ys = TITLE_HEIGHT + (self.__max_y - np.asarray(ys, dtype=np.float32)) * (
+            self.__scale
+        )
+        return np.column_stack((np.atleast_1d(xs), np.atleast_1d(ys)))
+
+    def draw(self, parts, title=None):
+        """Clears the canvas and draws a frame in a single batch of commands."""
+        if title is not None:
+            self.__title = title
+
+        with hold_canvas():
+            self.canvas.clear()
+            self.__draw_title()
+            self.__draw_axes()
+            self.__stroke_path("theta_circle", parts["theta_circle"])
+            self.__draw_circle(parts["circle"])
+            self.__stroke_path("period_wave", parts["period_wave"])
+            self.__stroke_path("full_wave", parts["full_wave"])
+            self.__draw_point(parts["point"])
+            self.__stroke_segment("terminal_arm", parts["terminal_arm"])
+            self.__stroke_segment("connecting_arm", parts["connecting_arm"])
+        return self
+
+    def __set_line_style(self, name):
+        style = self.__styles[name]
+        self.canvas.stroke_style = style["color"]
+        self.canvas.line_width = style.get("line_width", 1) * self.__pixels_per_point
+
+    def __draw_title(self):
+        self.canvas.font = TITLE_FONT
+        self.canvas.fill_style = self.__styles["title"]["color"]
+        self.canvas.text_align = "center"
+        self.canvas.fill_text(self.__title, self.canvas.width / 2, TITLE_HEIGHT / 2)
+
+    def __draw_axes(self):
+        self.__set_line_style("axes")
+        points = self.to_pixels(
+            [self.__min_x, self.__max_x, 0, 0],
+            [0, 0, self.__min_y, self.__max_y],
+        )
+        self.__stroke_between(points[0], points[1])
+        self.__stroke_between(points[2], points[3])
+
+    def __stroke_path(self, name, values):
+        if "range" in values:
+            xs, ys = values["range"], values["ys"]
+        else:
+            xs, ys = values["x"], values["y"]
+        if np.size(xs) < 2:
+            return
+        self.__set_line_style(name)
+        self.canvas.stroke_lines(self.to_pixels(xs, ys))
+
+    def __stroke_segment(self, name, values):
+        self.__set_line_style(name)
+        points = self.to_pixels(
+            [values["x1"], values["x2"]], [values["y1"], values["y2"]]
+        )
+        self.__stroke_between(points[0], points[1])
+
+    def __stroke_between(self, start, end):
+        # Scalars go into the JSON part of the message, so use Python floats.
+        self.canvas.stroke_line(*map(float, start), *map(float, end))
+
+    def __draw_circle(self, values):
+        self.__set_line_style("circle")
+        x, y = map(float, self.to_pixels(values["x"], values["y"])[0])
+        self.canvas.stroke_circle(x, y, abs(float(values["radius"])) * self.__scale)
+
+    def __draw_point(self, values):
+        self.canvas.fill_style = self.__styles["point"]["color"]
+        x, y = map(float, self.to_pixels(values["x"], values["y"])[0])
+        self.canvas.fill_circle(x, y, POINT_RADIUS)
@@ -0,0 +1,275 @@
+"""
+Exports the circle and wave animation to a video file without Jupyter.
+
+The frame range is split into chunks that are rasterised with Agg across a
+pool of worker processes. Each worker encodes its chunk and the chunks are
+joined with ffmpeg's concat demuxer, so export time scales with the number of
+cores.
+
+    python -m utils.notebooks.circle_sinosoidal.export wave.mp4 --seconds 10 \\
+        --frequency 2 --amplitude 1.5
+
+An output path without a video extension is treated as a directory and gets
+one PNG per frame instead. That needs nothing beyond matplotlib.
+
+With --stream, a single process pulls frames lazily from the frame generator
+and writes each raw RGBA buffer straight from the Agg canvas into ffmpeg's
+stdin. Memory use stays flat however long the recording is.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+import os
+from pathlib import Path
+import shutil
+import subprocess
+from tempfile import TemporaryDirectory
+from . import (
+    add_parameter_arguments,
+    define_state,
+    load_notebook,
+    parameters_from_arguments,
+    use_agg,
+)
+
+DEFAULT_SECONDS = 10
+DEFAULT_DPI = 100
+MIN_CHUNK_FRAMES = 20
+VIDEO_CODECS = {
+    ".mp4": ["-c:v", "libx264", "-pix_fmt", "yuv420p"],
+    ".webm": ["-c:v", "libvpx-vp9", "-pix_fmt", "yuv420p"],
+}
+FRAME_FILE_NAME = "frame_{:06d}.png"
+
+
+def default_fps():
+    return 1000 / load_notebook().ANIMATION_INTERVAL
+
+
+def split_frames(count, chunks):
+    """Splits range(count) into at most chunks contiguous (start, stop) pairs."""
+    chunks = max(1, min(chunks, count // MIN_CHUNK_FRAMES))
+    bounds = [round(i * count / chunks) for i in range(chunks + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def iterate_frames(notebook, state, start, stop):
+    """
+    Yields the frame data for frames start to stop. The frame generator is
+    cheap to run, so earlier frames are generated and skipped. The first frame
+    yielded is marked as changed, so every chunk draws the title.
+    """
+    frames = notebook.generate_frames(state)()
+    for _ in range(start):
+        next(frames)
+    for i in range(start, stop):
+        frame_data = next(frames)
+        if i == start:
+            frame_data = frame_data | {notebook.FrameField.CHANGED: True}
+        yield frame_data
+
+
+def render_chunk(task):
+    """
+    Renders frames start to stop. For a video, the chunk is encoded to its own
+    file; otherwise each frame is written as a PNG. Returns the path(s).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FFMpegWriter
+
+    parameters, start, stop, fps, dpi, path = itemgetter(
+        "parameters", "start", "stop", "fps", "dpi", "path"
+    )(task)
+    notebook = load_notebook()
+    state = define_state(notebook, parameters)
+    fig, animated_parts = itemgetter(
+        notebook.PlotPart.FIG,
+        notebook.PlotPart.ANIMATED_PARTS,
+    )(notebook.define_plot(plt))
+    animate = notebook.animate(animated_parts, state)
+    frames = iterate_frames(notebook, state, start, stop)
+
+    extension = Path(path).suffix.lower()
+    if extension in VIDEO_CODECS:
+        writer = FFMpegWriter(fps=fps, extra_args=VIDEO_CODECS[extension])
+        with writer.saving(fig, path, dpi):
+            for frame_data in frames:
+                animate(frame_data)
+                writer.grab_frame()
+        written = path
+    else:
+        written = []
+        for i, frame_data in enumerate(frames, start):
+            animate(frame_data)
+            frame_path = Path(path) / FRAME_FILE_NAME.format(i)
+            fig.savefig(frame_path, dpi=dpi)
+            written.append(str(frame_path))
+
+    plt.close(fig)
+    return written
+
+
+def concatenate(chunk_paths, output):
+    """Joins encoded chunks into one video without re-encoding them."""
+    list_path = Path(chunk_paths[0]).with_name("chunks.txt")
+    list_path.write_text("".join(f"file '{p}'\n" for p in chunk_paths))
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0"]
+        + ["-i", str(list_path), "-c", "copy", str(output)],
+        check=True,
+    )
+    return output
+
+
+def export(
+    output,
+    parameters=None,
+    seconds=DEFAULT_SECONDS,
+    fps=None,
+    dpi=DEFAULT_DPI,
+    workers=None,
+):
+    """Renders the animation for the parameters and writes it to output."""
+    fps = fps or default_fps()
+    workers = workers or os.cpu_count()
+    count = int(round(seconds * fps))
+    output = Path(output)
+    is_video = output.suffix.lower() in VIDEO_CODECS
+    if is_video and shutil.which("ffmpeg") is None:
+        raise RuntimeError(
+            "ffmpeg is needed to write a video. Export PNG frames to a "
+            "directory instead."
+        )
+
+    chunks = split_frames(count, workers)
+    with TemporaryDirectory() as temporary_directory:
+        if is_video:
+            paths = [
+                str(Path(temporary_directory) / f"chunk_{i:04d}{output.suffix}")
+                for i in range(len(chunks))
+            ]
+        else:
+            output.mkdir(parents=True, exist_ok=True)
+            paths = [str(output)] * len(chunks)
+
+        tasks = [
+            {
+                "parameters": parameters,
+                "start": start,
+                "stop": stop,
+                "fps": fps,
+                "dpi": dpi,
+                "path": path,
+            }
+            for (start, stop), path in zip(chunks, paths)
+        ]
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_agg) as executor:
+            written = list(executor.map(render_chunk, tasks))
+
+        if is_video:
+            return concatenate(written, output)
+    return output
+
+
+def stream_export(
+    output,
+    parameters=None,
+    seconds=DEFAULT_SECONDS,
+    fps=None,
+    dpi=DEFAULT_DPI,
+):
+    """
+    Renders the animation frame by frame into an ffmpeg pipe. Only one frame
+    exists at a time: the Agg buffer is passed to the pipe without a copy, and
+    a full pipe blocks rendering until ffmpeg catches up.
+    """
+    use_agg()
+    import matplotlib.pyplot as plt
+
+    fps = fps or default_fps()
+    output = Path(output)
+    if output.suffix.lower() not in VIDEO_CODECS:
+        raise ValueError(f"Streaming needs one of {', '.join(VIDEO_CODECS)}.")
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg is needed to stream a video.")
+
+    notebook = load_notebook()
+    state = define_state(notebook, parameters)
+    fig, animated_parts = itemgetter(
+        notebook.PlotPart.FIG,
+        notebook.PlotPart.ANIMATED_PARTS,
+    )(notebook.define_plot(plt))
+    fig.set_dpi(dpi)
+    animate = notebook.animate(animated_parts, state)
+    width, height = fig.canvas.get_width_height(physical=True)
+
+    process = subprocess.Popen(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo"]
+        + ["-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps)]
+        + ["-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        + VIDEO_CODECS[output.suffix.lower()]
+        + [str(output)],
+        stdin=subprocess.PIPE,
+    )
+    try:
+        count = int(round(seconds * fps))
+        for frame_data in iterate_frames(notebook, state, 0, count):
+            animate(frame_data)
+            fig.canvas.draw()
+            process.stdin.write(fig.canvas.buffer_rgba())
+    except BrokenPipeError:
+        pass
+    finally:
+        process.stdin.close()
+        process.wait()
+        plt.close(fig)
+
+    if process.returncode:
+        raise RuntimeError(f"ffmpeg exited with status {process.returncode}.")
+    return output
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "output", help="A .mp4 or .webm file, or a directory for PNG frames"
+    )
+    add_parameter_arguments(parser)
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    parser.add_argument("--fps", type=float, default=None)
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Render in one process through an ffmpeg pipe, in constant memory",
+    )
+    options = parser.parse_args(args)
+
+    if options.stream:
+        print(
+            stream_export(
+                options.output,
+                parameters_from_arguments(options),
+                seconds=options.seconds,
+                fps=options.fps,
+                dpi=options.dpi,
+            )
+        )
+        return
+
+    print(
+        export(
+            options.output,
+            parameters_from_arguments(options),
+            seconds=options.seconds,
+            fps=options.fps,
+            dpi=options.dpi,
+            workers=options.workers,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
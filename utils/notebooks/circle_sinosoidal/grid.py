@@ -0,0 +1,134 @@
+"""
+Renders a grid of static snapshots ("small multiples") of the circle and wave
+figure, one per combination of parameters. Useful for handouts.
+
+Snapshots are rendered in worker processes with the Agg backend and stitched
+into a single image. The output format follows the file extension, so a PNG or
+a PDF can be written.
+
+    python -m utils.notebooks.circle_sinosoidal.grid handout.pdf \\
+        --trig-function Sine Cosine --amplitude 0.5 1 2 --columns 3
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from operator import itemgetter
+import os
+import numpy as np
+from utils.maths.trigonometry import period
+from . import (
+    add_parameter_arguments,
+    define_state,
+    load_notebook,
+    parameters_from_arguments,
+    use_agg,
+)
+
+DEFAULT_COLUMNS = 4
+DEFAULT_POSITION = 0.25
+BACKGROUND_VALUE = 255
+
+
+def parameter_combinations(options):
+    """Returns a list of parameter dictionaries, one for every combination of
+    the supplied option values.
+
+    The keys of the options are the values of the notebook's StateProp enum,
+    plus "position", the fraction of the period to draw the snapshot at.
+    """
+    keys = list(options.keys())
+    return [dict(zip(keys, values)) for values in product(*options.values())]
+
+
+def render_snapshot(parameters):
+    """Renders a single snapshot and returns it as an RGBA array."""
+    import matplotlib.pyplot as plt
+
+    notebook = load_notebook()
+    position = parameters.get("position", DEFAULT_POSITION)
+    state = define_state(
+        notebook, {k: v for k, v in parameters.items() if k != "position"}
+    )
+
+    fig, animated_parts = itemgetter(
+        notebook.PlotPart.FIG,
+        notebook.PlotPart.ANIMATED_PARTS,
+    )(notebook.define_plot(plt))
+
+    frequency = state.get(notebook.StateProp.HORIZONTAL_SCALAR)
+    notebook.animate(animated_parts, state)(
+        {
+            notebook.FrameField.I: 0,
+            notebook.FrameField.X: position * period()(frequency),
+            notebook.FrameField.CHANGED: True,
+        }
+    )
+
+    fig.canvas.draw()
+    image = np.array(fig.canvas.buffer_rgba())
+    plt.close(fig)
+    return image
+
+
+def stitch(images, columns=DEFAULT_COLUMNS):
+    """Stitches equally sized images into a single image, left to right and
+    top to bottom. Unused cells are left blank.
+    """
+    height, width, channels = images[0].shape
+    rows = -(-len(images) // columns)
+    grid = np.full(
+        (rows * height, columns * width, channels), BACKGROUND_VALUE, dtype=np.uint8
+    )
+    for i, image in enumerate(images):
+        row, column = divmod(i, columns)
+        grid[
+            row * height : (row + 1) * height, column * width : (column + 1) * width
+        ] = image
+    return grid
+
+
+def render_grid(combinations, columns=DEFAULT_COLUMNS, workers=None):
+    """Renders every combination across a pool of worker processes and returns
+    the stitched grid.
+    """
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(combinations) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_agg) as executor:
+        images = list(executor.map(render_snapshot, combinations, chunksize=chunksize))
+    return stitch(images, columns)
+
+
+def save_grid(path, grid):
+    """Saves the grid. The format (e.g. PNG, PDF) follows the extension."""
+    use_agg()
+    import matplotlib.image as mpimg
+
+    mpimg.imsave(path, grid)
+    return path
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="Output file, e.g. handout.png or handout.pdf")
+    add_parameter_arguments(parser, nargs="+")
+    parser.add_argument(
+        "--position",
+        nargs="+",
+        type=float,
+        default=[DEFAULT_POSITION],
+        help="Fraction of the period to draw each snapshot at",
+    )
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS)
+    parser.add_argument("--workers", type=int, default=None)
+    options = parser.parse_args(args)
+
+    combinations = parameter_combinations(
+        parameters_from_arguments(options) | {"position": options.position}
+    )
+    grid = render_grid(combinations, options.columns, options.workers)
+    print(save_grid(options.output, grid))
+
+
+if __name__ == "__main__":
+    main()
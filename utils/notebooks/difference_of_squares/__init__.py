@@ -37,10 +37,10 @@ class RenderUtils:
     """A class the provides utility methods for use in "A Difference of Squares"
     notebook.
 
-    The class methods make extensive use of a supplied CanvasRenderer class.
+    The methods make extensive use of a supplied CanvasRenderer, so there can
+    be one RenderUtils per canvas, or per layer of a MultiCanvas.
     """
 
-    __renderer: CanvasRenderer = None
     __dimensions = {
         "a": PLOT_CONTENT_A_DIMENSION,
         "b": PLOT_CONTENT_B_DIMENSION,
@@ -54,37 +54,33 @@ class RenderUtils:
         "center_a_minus_b": (PLOT_CONTENT_A_DIMENSION - PLOT_CONTENT_B_DIMENSION) / 2,
     }
 
-    @classmethod
-    def set_renderer(cls, renderer):
-        """Applies the CanvasRenderer. This needs to be called before other class
-        methods.
-        """
-        cls.__renderer = renderer
-        return cls
+    def __init__(self, renderer: CanvasRenderer):
+        self.__renderer = renderer
+
+    @property
+    def renderer(self):
+        return self.__renderer
 
-    @classmethod
-    def clear(cls):
+    def clear(self):
         """A convenience method for clearing the whole canvas."""
-        cls.__renderer.clear()
-        return cls
+        self.__renderer.clear()
+        return self
 
-    @classmethod
-    def label(cls, label, settings=None):
+    def label(self, label, settings=None):
         """A convenience method for drawing a label."""
         if settings is None:
             settings = DEFAULT_LABEL_SETTINGS
-        cls.__renderer.label(label, settings)
-        return cls
+        self.__renderer.label(label, settings)
+        return self
 
-    @classmethod
-    def a_rect(cls):
+    def a_rect(self):
         """Fills the "a" area of the canvas."""
         color = Color.LIGHT_GRAY.value
         a, left_margin, top_margin = itemgetter("a", "left_margin", "top_margin")(
-            cls.__dimensions
+            self.__dimensions
         )
 
-        cls.__renderer.fill_rect(
+        self.__renderer.fill_rect(
             {
                 "color": color,
                 "x": left_margin,
@@ -93,10 +89,9 @@ class RenderUtils:
                 "height": a,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def a_plus_b_rect(cls):
+    def a_plus_b_rect(self):
         """Fills and strokes a rectangle with dimensions of "a+b" as the width
         and "a-b" as the height.
         """
@@ -106,10 +101,10 @@ class RenderUtils:
             "top_margin",
             "a_plus_b",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
         (
-            cls.__renderer.fill_rect(
+            self.__renderer.fill_rect(
                 {
                     "color": color,
                     "x": left_margin,
@@ -127,10 +122,9 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def a_minus_b_rect(cls):
+    def a_minus_b_rect(self):
         """Fills and strokes a rectangle with dimensions of "a" as the width and
         "a-b" as the height.
         """
@@ -140,10 +134,10 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
         (
-            cls.__renderer.fill_rect(
+            self.__renderer.fill_rect(
                 {
                     "color": color,
                     "x": left_margin,
@@ -161,10 +155,9 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def b_rect(cls):
+    def b_rect(self):
         """Fills a square of the "b" dimension."""
         color = Color.LIGHTER_GRAY.value
         b, left_margin, top_margin, a_minus_b = itemgetter(
@@ -172,10 +165,10 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
         (
-            cls.__renderer.clear(
+            self.__renderer.clear(
                 {
                     "x": left_margin + a_minus_b,
                     "y": top_margin + a_minus_b,
@@ -192,10 +185,9 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def b_rect_horizontal(cls, offset=0):
+    def b_rect_horizontal(self, offset=0):
         """Fills and strokes a rectangle with dimensions of "a-b" as the width
         and "b" as the height.
         """
@@ -205,10 +197,10 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
         (
-            cls.__renderer.fill_rect(
+            self.__renderer.fill_rect(
                 {
                     "color": color,
                     "x": left_margin,
@@ -226,10 +218,9 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def b_rect_vertical(cls, offset=0):
+    def b_rect_vertical(self, offset=0):
         """Fills and strokes a rectangle with dimensions of "b" as the width
         and "a-b" as the height.
         """
@@ -240,10 +231,10 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
         (
-            cls.__renderer.fill_rect(
+            self.__renderer.fill_rect(
                 {
                     "color": color,
                     "x": left_margin + a + offset,
@@ -261,20 +252,19 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def a_bar(cls):
+    def a_bar(self):
         """Draws the "a" label bar in the left margin."""
         color = Color.GRAY.value
         a, left_margin, top_margin = itemgetter(
             "a",
             "left_margin",
             "top_margin",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
         (
-            cls.__renderer.stroke_line(
+            self.__renderer.stroke_line(
                 {
                     "color": color,
                     "line_dash": [],
@@ -305,10 +295,9 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def b_border(cls):
+    def b_border(self):
         """Draws a dashed line around the "b" section of the total area."""
         color = Color.GRAY.value
         a, left_margin, top_margin, a_minus_b = itemgetter(
@@ -316,9 +305,9 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.__renderer.stroke_lines(
+        self.__renderer.stroke_lines(
             {
                 "color": color,
                 "line_dash": [5, 10],
@@ -329,19 +318,18 @@ class RenderUtils:
                 ],
             }
         )
-        return cls
+        return self
 
     ####
-    @classmethod
-    def a_plus_b_border(cls):
+    def a_plus_b_border(self):
         """Strokes a rectangle of the "a" dimension."""
         color = Color.LIGHT_GRAY.value
         a, left_margin, top_margin = itemgetter(
             "a",
             "left_margin",
             "top_margin",
-        )(cls.__dimensions)
-        cls.__renderer.stroke_rect(
+        )(self.__dimensions)
+        self.__renderer.stroke_rect(
             {
                 "color": color,
                 "x": left_margin,
@@ -350,10 +338,9 @@ class RenderUtils:
                 "height": a,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def a_minus_b(cls):
+    def a_minus_b(self):
         """Fills and strokes a polygon of "b" subtracted from "a"."""
         color = Color.LIGHT_GRAY.value
         a, left_margin, top_margin, a_minus_b = itemgetter(
@@ -361,7 +348,7 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
         points = [
             (left_margin, top_margin),
             (left_margin + a, top_margin),
@@ -372,7 +359,7 @@ class RenderUtils:
         ]
 
         (
-            cls.__renderer.fill_polygon(
+            self.__renderer.fill_polygon(
                 {
                     "color": color,
                     "points": points,
@@ -384,10 +371,9 @@ class RenderUtils:
                 }
             )
         )
-        return cls
+        return self
 
-    @classmethod
-    def a_plus_b_line(cls):
+    def a_plus_b_line(self):
         """Draws a dashed line along the right border of "a", where it will be
         combined with "b"."""
         color = Color.GRAY.value
@@ -396,9 +382,9 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.__renderer.stroke_line(
+        self.__renderer.stroke_line(
             {
                 "color": color,
                 "line_dash": [5, 10],
@@ -408,10 +394,9 @@ class RenderUtils:
                 "y2": top_margin + a_minus_b,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def a_minus_b_line(cls):
+    def a_minus_b_line(self):
         """Draws a dashed line along the bottom of "a-b", where "b" will be
         removed from "a"."""
         color = Color.GRAY.value
@@ -420,9 +405,9 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.__renderer.stroke_line(
+        self.__renderer.stroke_line(
             {
                 "color": color,
                 "line_dash": [5, 10],
@@ -432,46 +417,43 @@ class RenderUtils:
                 "y2": top_margin + a_minus_b,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_left(cls):
+    def label_a_left(self):
         """Draws the "a" label along the left margin."""
         left_margin, top_margin, center_a = itemgetter(
             "left_margin",
             "top_margin",
             "center_a",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a",
                 "x": left_margin - 48,
                 "y": top_margin + center_a,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_top(cls):
+    def label_a_top(self):
         """Draws the "a" label along the top margin."""
         left_margin, top_margin, center_a = itemgetter(
             "left_margin",
             "top_margin",
             "center_a",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a",
                 "x": left_margin + center_a,
                 "y": top_margin - 10,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_bottom(cls):
+    def label_a_bottom(self):
         """Draws the "a" label along the bottom of "a", after "b" has been
         removed."""
         left_margin, top_margin, center_a, a_minus_b = itemgetter(
@@ -479,57 +461,54 @@ class RenderUtils:
             "top_margin",
             "center_a",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a",
                 "x": left_margin + center_a,
                 "y": top_margin + a_minus_b + 18,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_b_box_right(cls):
+    def label_b_box_right(self):
         """Draws the "b" label along the right side of the "b" square area."""
         a, left_margin, top_margin, center_b = itemgetter(
             "a",
             "left_margin",
             "top_margin",
             "center_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "b",
                 "x": left_margin + a + 15,
                 "y": top_margin + a - center_b + 2,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_b_box_bottom(cls):
+    def label_b_box_bottom(self):
         """Draws the "b" label along the bottom of the "b" square area."""
         a, left_margin, top_margin, center_b = itemgetter(
             "a",
             "left_margin",
             "top_margin",
             "center_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "b",
                 "x": left_margin + a - center_b - 2,
                 "y": top_margin + a + 22,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_b_left(cls, vertical_offset=0):
+    def label_b_left(self, vertical_offset=0):
         """Draws the "b" label in the left margin, where "b" will be removed
         from "a"."""
         a, left_margin, top_margin, center_b = itemgetter(
@@ -537,19 +516,18 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "center_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "b",
                 "x": left_margin - 18,
                 "y": top_margin + a - center_b + 2 + vertical_offset,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_b_right(cls, vertical_offset=0):
+    def label_b_right(self, vertical_offset=0):
         """Draws the "b" label along the right side of where the "b" area has
         been removed from "a"."""
         a, left_margin, top_margin, a_minus_b, center_b = itemgetter(
@@ -558,19 +536,18 @@ class RenderUtils:
             "top_margin",
             "a_minus_b",
             "center_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "b",
                 "x": left_margin + a_minus_b + 10,
                 "y": top_margin + a - center_b + 2 + vertical_offset,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_b_top(cls, horizontal_offset=0):
+    def label_b_top(self, horizontal_offset=0):
         """Draws the "b" label in the top margin where the "b" will be added to
         "a"."""
         a, left_margin, top_margin, center_b = itemgetter(
@@ -578,19 +555,18 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "center_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "b",
                 "x": left_margin + a + center_b - 7 + horizontal_offset,
                 "y": top_margin - 10,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_b_bottom(cls, horizontal_offset=0):
+    def label_b_bottom(self, horizontal_offset=0):
         """Draws the "b" label along the bottom where the "b" will be added to
         "a"."""
         a, left_margin, top_margin, center_b, a_minus_b = itemgetter(
@@ -599,112 +575,106 @@ class RenderUtils:
             "top_margin",
             "center_b",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "b",
                 "x": left_margin + a + center_b - 7 + horizontal_offset,
                 "y": top_margin + a_minus_b + 18,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_minus_b_left(cls):
+    def label_a_minus_b_left(self):
         """Draws the "a - b" label in the left margin."""
         left_margin, top_margin, center_a = itemgetter(
             "left_margin",
             "top_margin",
             "center_a",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a - b",
                 "x": left_margin - 44,
                 "y": top_margin + center_a - 30,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_minus_b_right(cls, horizontal_offset=0):
+    def label_a_minus_b_right(self, horizontal_offset=0):
         """Draws the "a - b" label along the right side of "a"."""
         a, left_margin, top_margin, center_a = itemgetter(
             "a",
             "left_margin",
             "top_margin",
             "center_a",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a - b",
                 "x": left_margin + a + 8 + horizontal_offset,
                 "y": top_margin + center_a - 30,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_minus_b_bottom(cls, vertical_offset=0):
+    def label_a_minus_b_bottom(self, vertical_offset=0):
         """Draws the "a - b" label along the bottom."""
         a, left_margin, top_margin, center_a_minus_b = itemgetter(
             "a",
             "left_margin",
             "top_margin",
             "center_a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a - b",
                 "x": left_margin + center_a_minus_b - 20,
                 "y": top_margin + a + 22 + vertical_offset,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_plus_b_top(cls):
+    def label_a_plus_b_top(self):
         """Draws the "a + b" label in the top margin."""
         left_margin, top_margin, center_a_plus_b = itemgetter(
             "left_margin",
             "top_margin",
             "center_a_plus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a + b",
                 "x": left_margin + center_a_plus_b - 20,
                 "y": top_margin - 8,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def label_a_plus_b_bottom(cls):
+    def label_a_plus_b_bottom(self):
         """Draws the "a + b" label along the bottom of the plot."""
         left_margin, top_margin, center_a_plus_b, a_minus_b = itemgetter(
             "left_margin",
             "top_margin",
             "center_a_plus_b",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.label(
+        self.label(
             {
                 "text": "a + b",
                 "x": left_margin + center_a_plus_b - 20,
                 "y": top_margin + a_minus_b + 20,
             }
         )
-        return cls
+        return self
 
-    @classmethod
-    def b_box_snip(cls):
+    def b_box_snip(self):
         """Draws the "snip" label before removing the "b" area from "a"."""
         color = Color.BLACK.value
         a, left_margin, top_margin, center_b, a_minus_b = itemgetter(
@@ -713,9 +683,9 @@ class RenderUtils:
             "top_margin",
             "center_b",
             "a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.__renderer.clear(
+        self.__renderer.clear(
             {
                 "x": left_margin + a_minus_b - 20,
                 "y": top_margin + a - center_b - 14,
@@ -734,11 +704,10 @@ class RenderUtils:
             "y": top_margin + a - center_b + 2,
         }
 
-        cls.label(label, settings)
-        return cls
+        self.label(label, settings)
+        return self
 
-    @classmethod
-    def a_minus_b_snip(cls):
+    def a_minus_b_snip(self):
         """Draws the "snip" label before removing the "b" rectangle from "a"."""
         color = Color.BLACK.value
         left_margin, top_margin, a_minus_b, center_a_minus_b = itemgetter(
@@ -746,9 +715,9 @@ class RenderUtils:
             "top_margin",
             "a_minus_b",
             "center_a_minus_b",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.__renderer.clear(
+        self.__renderer.clear(
             {
                 "x": left_margin + center_a_minus_b - 20,
                 "y": top_margin + a_minus_b - 12,
@@ -765,11 +734,10 @@ class RenderUtils:
             "font": "14px serif",
             "font_color": color,
         }
-        cls.label(label, settings)
-        return cls
+        self.label(label, settings)
+        return self
 
-    @classmethod
-    def a_plus_b_paste(cls):
+    def a_plus_b_paste(self):
         """Draws the "paste" label before adding the "b" rectangle to "a"."""
         color = Color.BLACK.value
         a, left_margin, top_margin, center_a = itemgetter(
@@ -777,9 +745,9 @@ class RenderUtils:
             "left_margin",
             "top_margin",
             "center_a",
-        )(cls.__dimensions)
+        )(self.__dimensions)
 
-        cls.__renderer.clear(
+        self.__renderer.clear(
             {
                 "x": left_margin + a - 21,
                 "y": top_margin + center_a - 48,
@@ -796,5 +764,5 @@ class RenderUtils:
             "font": "14px serif",
             "font_color": color,
         }
-        cls.label(label, settings)
-        return cls
+        self.label(label, settings)
+        return self
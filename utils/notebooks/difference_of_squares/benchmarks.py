@@ -0,0 +1,225 @@
+"""
+Benchmarks for "A Visual Proof: Difference of Squares". Run them with:
+
+    python -m utils.notebooks.difference_of_squares.benchmarks
+
+Each benchmark returns a dictionary of results; main() prints them as JSON.
+render_step_images() draws each step without a browser and writes it to PNG.
+"""
+
+import json
+from pathlib import Path
+from time import perf_counter
+from utils.graphics.canvas_renderer import CanvasRenderer
+from ..startup_trace import ROOT, difference_of_squares_phase, split_notebook
+from . import CANVAS_HEIGHT, CANVAS_WIDTH, RenderUtils
+
+NOTEBOOK_PATH = ROOT / "01_difference_of_squares.ipynb"
+
+
+def load_notebook():
+    """
+    Runs the notebook's imports and definitions, e.g. draw_step1, and returns
+    its namespace. Nothing is drawn or displayed.
+    """
+    namespace = {}
+    for phase, source in split_notebook(NOTEBOOK_PATH, difference_of_squares_phase):
+        if phase == "import":
+            exec(source, namespace)
+    return namespace
+
+
+def define_canvas(namespace, canvas=None):
+    """
+    Sets up a canvas and its renderers in the notebook's namespace, as the
+    notebook does, and returns the renderer. The canvas is a RoughCanvas
+    unless another, e.g. a RasterCanvas, is given.
+    """
+    if canvas is None:
+        from ipycanvas import RoughCanvas
+
+        canvas = RoughCanvas(width=CANVAS_WIDTH, height=CANVAS_HEIGHT)
+    renderer = CanvasRenderer(
+        canvas,
+        {
+            "font": canvas.font,
+            "fill_style": canvas.fill_style,
+            "stroke_style": canvas.stroke_style,
+            "line_dash": canvas.get_line_dash(),
+        },
+    )
+    namespace.update(
+        canvas=canvas, renderer=renderer, render_utils=RenderUtils(renderer)
+    )
+    return renderer
+
+
+def _draw_step(namespace, step):
+    # What update_display() draws for a step, without the title.
+    renderer = namespace["renderer"]
+    renderer.restore(renderer.defaults())
+    namespace["update_canvas"](step)
+
+
+def _define_baseline_canvas(namespace):
+    # As define_canvas(), with the renderer the notebook had before record().
+    from ipycanvas import RoughCanvas
+    from .baseline_renderer import CanvasRenderer as BaselineRenderer
+
+    canvas = RoughCanvas(width=CANVAS_WIDTH, height=CANVAS_HEIGHT)
+    renderer = BaselineRenderer.set_canvas(canvas).set_defaults(
+        {
+            "font": canvas.font,
+            "fill_style": canvas.fill_style,
+            "stroke_style": canvas.stroke_style,
+        }
+    )
+    namespace.update(
+        canvas=canvas, renderer=renderer, render_utils=RenderUtils(renderer)
+    )
+    return renderer
+
+
+def benchmark_step_messages():
+    """
+    Counts the canvas commands, messages and bytes each step sends:
+
+    - baseline, with the renderer from before record(), which sends every
+      style change and restore,
+    - immediate, with the current renderer, sending each call as it's made,
+    - recorded, with the current renderer inside record(), as the notebook
+      draws them.
+
+    Each mode draws each step onto a canvas of its own, so none of them
+    starts from a style another left behind.
+    """
+    from utils.graphics.canvas_metrics import CanvasMessageCounter
+
+    namespace = load_notebook()
+    steps = []
+    for step in range(1, namespace["ANIMATION_MAX_STEPS"] + 1):
+        _define_baseline_canvas(namespace)
+        with CanvasMessageCounter() as baseline:
+            _draw_step(namespace, step)
+
+        define_canvas(namespace)
+        with CanvasMessageCounter() as immediate:
+            _draw_step(namespace, step)
+
+        renderer = define_canvas(namespace)
+        with CanvasMessageCounter() as recorded:
+            with renderer.record():
+                _draw_step(namespace, step)
+
+        steps.append(
+            {
+                "step": step,
+                "baseline": baseline.as_dict(),
+                "immediate": immediate.as_dict(),
+                "recorded": recorded.as_dict(),
+            }
+        )
+    return {"steps": steps}
+
+
+def benchmark_bulk_primitives(count=1000):
+    """
+    Counts the commands, messages and bytes sent to fill count rectangles
+    of different colours, one call per rectangle and as one fill_rects.
+    """
+    import numpy as np
+    from utils.graphics.canvas_metrics import CanvasMessageCounter
+
+    renderer = define_canvas({})
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(0, CANVAS_WIDTH, count)
+    ys = rng.uniform(0, CANVAS_HEIGHT, count)
+    colors = rng.integers(0, 256, (count, 3))
+    with CanvasMessageCounter() as single:
+        for x, y, color in zip(xs, ys, colors):
+            renderer.fill_rect(
+                {
+                    "color": "#{:02x}{:02x}{:02x}".format(*color),
+                    "x": x,
+                    "y": y,
+                    "width": 10,
+                    "height": 10,
+                }
+            )
+    with CanvasMessageCounter() as bulk:
+        renderer.fill_rects(
+            {"color": colors, "x": xs, "y": ys, "width": 10, "height": 10}
+        )
+    return {"count": count, "single": single.as_dict(), "bulk": bulk.as_dict()}
+
+
+def render_step_images(directory):
+    """
+    Draws each step onto a RasterCanvas and writes it to step<n>.png in the
+    directory. Returns the paths written.
+    """
+    from utils.graphics.raster_canvas import RasterCanvas
+
+    namespace = load_notebook()
+    canvas = RasterCanvas(width=CANVAS_WIDTH, height=CANVAS_HEIGHT)
+    renderer = define_canvas(namespace, canvas)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for step in range(1, namespace["ANIMATION_MAX_STEPS"] + 1):
+        with renderer.record():
+            _draw_step(namespace, step)
+        paths.append(directory / f"step{step}.png")
+        canvas.save(paths[-1])
+    return paths
+
+
+def benchmark_raster(runs=20):
+    """
+    Times drawing every step, recorded as the notebook does, onto the widget
+    and onto a RasterCanvas, and encoding the raster as a PNG. The widget is
+    timed up to sending its messages, as there's no frontend to draw them.
+    """
+    from io import BytesIO
+    from utils.graphics.raster_canvas import RasterCanvas
+
+    namespace = load_notebook()
+    raster = RasterCanvas(width=CANVAS_WIDTH, height=CANVAS_HEIGHT)
+    step_count = namespace["ANIMATION_MAX_STEPS"]
+
+    def time_steps(canvas):
+        renderer = define_canvas(namespace, canvas)
+        # The first run loads fonts and the like, so it isn't timed.
+        for run in range(runs + 1):
+            if run == 1:
+                start = perf_counter()
+            for step in range(1, step_count + 1):
+                with renderer.record():
+                    _draw_step(namespace, step)
+        return (perf_counter() - start) / (runs * step_count)
+
+    widget = time_steps(None)
+    drawn = time_steps(raster)
+    start = perf_counter()
+    for _ in range(runs):
+        raster.to_image().save(BytesIO(), format="PNG")
+    png = (perf_counter() - start) / runs
+    return {
+        "runs": runs,
+        "seconds_per_step": {"widget": widget, "raster": drawn, "png": png},
+    }
+
+
+BENCHMARKS = {
+    "step_messages": benchmark_step_messages,
+    "bulk_primitives": benchmark_bulk_primitives,
+    "raster": benchmark_raster,
+}
+
+
+def main():
+    print(json.dumps({k: fn() for k, fn in BENCHMARKS.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Measures how long each notebook takes from kernel start to its first frame.
+Run it with:
+
+    python -m utils.notebooks.startup_trace [--runs 3] [--output trace.json]
+
+Each notebook runs headless in a fresh kernel through nbclient. Its code is
+split into top-level statements, and consecutive statements of the same phase
+are run as one cell, so the time can be broken down into:
+
+- kernel, starting the kernel until it's ready for code,
+- import, the imports and definitions,
+- widgets, constructing and laying out the widgets,
+- figure, setting up the canvas or figure the frames are drawn on,
+- first_render, drawing the first frame.
+
+A headless kernel has no browser, so the first frame is counted as rendered
+once its draw commands have been sent, or for matplotlib, once it's been
+rasterised. The trace is printed as JSON, with the median of each phase.
+"""
+
+import argparse
+import ast
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[2]
+KERNEL_NAME = "python3"
+CELL_TIMEOUT = 120  # Seconds.
+DEFAULT_RUNS = 3
+PHASES = ["kernel", "import", "widgets", "figure", "first_render"]
+
+# "A Circle and Its Sinosoidal Wave" is set up by main(), which also starts an
+# animation whose first frame is drawn by the browser. These cells follow the
+# same steps, then draw the first frame with animate() directly.
+CIRCLE_SINOSOIDAL_CELLS = [
+    ("import", "notebook = __import__('03_circle_sinosoidal')"),
+    (
+        "widgets",
+        """\
+from IPython.display import display
+state = notebook.define_initial_state()
+ui = notebook.define_ui(state)
+display(ui)""",
+    ),
+    (
+        "figure",
+        """\
+import matplotlib.pyplot as plt
+plot = notebook.define_plot(plt)""",
+    ),
+    (
+        "first_render",
+        """\
+animated_parts = plot[notebook.PlotPart.ANIMATED_PARTS]
+frame_data = next(notebook.generate_frames(state)())
+notebook.animate(animated_parts, state)(frame_data)
+plot[notebook.PlotPart.FIG].canvas.draw()""",
+    ),
+]
+
+
+def difference_of_squares_phase(statement, source):
+    """Returns the phase of a top-level statement in "Difference of Squares"."""
+    # The first draw_step1 happens when the last cell calls update().
+    if (
+        isinstance(statement, ast.Expr)
+        and isinstance(statement.value, ast.Call)
+        and getattr(statement.value.func, "id", None) == "update"
+    ):
+        return "first_render"
+    if isinstance(
+        statement, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)
+    ):
+        return "import"
+    if isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Constant):
+        return "import"
+    if "Canvas" in source or "RenderUtils" in source:
+        return "figure"
+    return "widgets"
+
+
+def split_notebook(path, phase):
+    """
+    Returns the (phase, source) of each top-level statement in a notebook's
+    code cells, with consecutive statements of the same phase joined.
+    """
+    import nbformat
+
+    notebook = nbformat.read(path, as_version=4)
+    steps = []
+    for cell in notebook.cells:
+        if cell.cell_type != "code":
+            continue
+        lines = cell.source.splitlines()
+        for statement in ast.parse(cell.source).body:
+            # A function's line number is its def, after any decorators.
+            decorators = getattr(statement, "decorator_list", None)
+            start = (decorators[0] if decorators else statement).lineno - 1
+            source = "\n".join(lines[start : statement.end_lineno])
+            name = phase(statement, source)
+            if steps and steps[-1][0] == name:
+                steps[-1] = (name, f"{steps[-1][1]}\n{source}")
+            else:
+                steps.append((name, source))
+    return steps
+
+
+NOTEBOOKS = {
+    "01_difference_of_squares.ipynb": lambda: split_notebook(
+        ROOT / "01_difference_of_squares.ipynb", difference_of_squares_phase
+    ),
+    "03_circle_sinosoidal.py": lambda: CIRCLE_SINOSOIDAL_CELLS,
+}
+
+
+def trace(steps, kernel_name=KERNEL_NAME):
+    """
+    Runs the (phase, source) steps in a fresh kernel, started in the
+    repository's root, and returns the seconds spent in each phase.
+    """
+    import nbformat
+    from nbclient import NotebookClient
+
+    notebook = nbformat.v4.new_notebook(
+        cells=[nbformat.v4.new_code_cell(source) for _, source in steps]
+    )
+    client = NotebookClient(
+        notebook,
+        timeout=CELL_TIMEOUT,
+        kernel_name=kernel_name,
+        resources={"metadata": {"path": str(ROOT)}},
+    )
+
+    seconds = dict.fromkeys(PHASES, 0.0)
+    start = perf_counter()
+    with client.setup_kernel():
+        seconds["kernel"] = perf_counter() - start
+        for index, (cell, (phase, _)) in enumerate(zip(notebook.cells, steps)):
+            cell_start = perf_counter()
+            client.execute_cell(cell, index)
+            seconds[phase] += perf_counter() - cell_start
+    return seconds
+
+
+def trace_notebook(name, runs=DEFAULT_RUNS):
+    steps = NOTEBOOKS[name]()
+    results = [trace(steps) for _ in range(runs)]
+    phases = {phase: median(r[phase] for r in results) for phase in PHASES}
+    return {
+        "runs": runs,
+        "cells": len(steps),
+        "phases": phases,
+        "time_to_first_frame": median(sum(r.values()) for r in results),
+        "samples": results,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument(
+        "--notebook", choices=list(NOTEBOOKS), action="append", dest="notebooks"
+    )
+    parser.add_argument("--output", help="A file to write the trace to, as well")
+    options = parser.parse_args(args)
+
+    result = {
+        name: trace_notebook(name, options.runs)
+        for name in options.notebooks or NOTEBOOKS
+    }
+    text = json.dumps(result, indent=2)
+    if options.output:
+        Path(options.output).write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Provides samples of a function over a wide domain at several resolutions,
+so a plot can be zoomed out over thousands of periods without drawing, or
+even reading, every sample.
+"""
+
+import numpy as np
+
+MIN_COLUMNS = 64  # The coarsest level keeps at least this many columns.
+
+
+class SamplePyramid:
+    """
+    Like the mipmaps of a texture: level 0 holds the samples, and each level
+    above it halves their number, keeping the lowest and highest y of each
+    pair, so every peak survives however far the view is zoomed out.
+
+    A view reads only the visible slice of the coarsest level that still has
+    a sample for every pixel column. Zoomed in further than level 0 goes, the
+    function is sampled once per column instead.
+    """
+
+    def __init__(self, fnc, domain, samples, min_columns=MIN_COLUMNS):
+        """
+        The function takes an array of x and returns an array of y. The
+        domain is (start, end) and samples is the number at level 0.
+        """
+        x0, x1 = domain
+        xs = np.linspace(x0, x1, samples)
+        ys = fnc(xs)
+        self.domain = domain
+        self.__fnc = fnc
+        self.__spacing = (x1 - x0) / (samples - 1)
+        self.__levels = [(xs, ys, ys)]
+        while len(self.__levels[-1][0]) >= min_columns * 2:
+            self.__levels.append(_halve(*self.__levels[-1]))
+
+    def __len__(self):
+        return len(self.__levels)
+
+    @property
+    def nbytes(self):
+        # Level 0's lows and highs are the same array.
+        xs, ys, _ = self.__levels[0]
+        return xs.nbytes + ys.nbytes + sum(
+            sum(a.nbytes for a in level) for level in self.__levels[1:]
+        )
+
+    def level(self, x_range, columns):
+        """Returns the level a view of x_range across columns pixels reads."""
+        x0, x1 = x_range
+        per_column = (x1 - x0) / self.__spacing / max(1, columns)
+        level = int(np.floor(np.log2(max(per_column, 1))))
+        return min(level, len(self.__levels) - 1)
+
+    def view(self, x_range, columns):
+        """
+        Returns (xs, ys) for x_range across columns pixels: the samples at
+        level 0, or a low and a high per column above it, plus one column
+        either side so the line runs off the edges.
+        """
+        x0, x1 = x_range
+        if (x1 - x0) / self.__spacing < columns:
+            xs = np.linspace(x0, x1, columns + 1)
+            return xs, self.__fnc(xs)
+
+        level = self.level(x_range, columns)
+        xs, lows, highs = self.__levels[level]
+        start = max(0, np.searchsorted(xs, x0) - 1)
+        end = np.searchsorted(xs, x1) + 1
+        xs, lows, highs = xs[start:end], lows[start:end], highs[start:end]
+        if level == 0:
+            return xs, lows
+        return np.repeat(xs, 2), np.column_stack((lows, highs)).ravel()
+
+
+def _halve(xs, lows, highs):
+    if len(xs) % 2:
+        xs, lows, highs = (np.append(a, a[-1]) for a in (xs, lows, highs))
+    return (
+        (xs[0::2] + xs[1::2]) / 2,
+        np.minimum(lows[0::2], lows[1::2]),
+        np.maximum(highs[0::2], highs[1::2]),
+    )
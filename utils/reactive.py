@@ -0,0 +1,73 @@
+"""
+Provides a small dependency graph for values derived from a set of inputs, so
+that only the values affected by a change are recalculated.
+"""
+
+from collections import Counter, defaultdict
+
+
+class DependencyGraph:
+    """
+    Each node is a value calculated from inputs (e.g. state properties) and
+    other nodes. Setting the inputs marks the nodes that depend on a changed
+    input, directly or through other nodes, as stale. A stale node is
+    recalculated the next time it's read; every other read returns the value
+    calculated before.
+
+    Nodes have to be added after the nodes they depend on, which keeps the
+    graph free of cycles.
+    """
+
+    def __init__(self):
+        self.__nodes = {}
+        self.__dependents = defaultdict(set)
+        self.__inputs = {}
+        self.__values = {}
+        self.__stale = set()
+        self.recomputed = Counter()
+
+    def node(self, name, calculate, depends_on):
+        """
+        Adds a node. The calculate function is passed a dictionary of the
+        current values of the inputs and nodes it depends on.
+        """
+        if name in self.__nodes:
+            raise ValueError(f"There's already a node named {name}.")
+        for dependency in depends_on:
+            self.__dependents[dependency].add(name)
+        self.__nodes[name] = (calculate, list(depends_on))
+        self.__stale.add(name)
+        return self
+
+    def set_inputs(self, values):
+        """Updates the inputs and returns the nodes that are now stale."""
+        for k, v in values.items():
+            if k in self.__inputs and self.__inputs[k] == v:
+                continue
+            self.__inputs[k] = v
+            self.__invalidate(k)
+        return set(self.__stale)
+
+    def get(self, name):
+        if name in self.__stale:
+            calculate, depends_on = self.__nodes[name]
+            self.__values[name] = calculate({k: self.__read(k) for k in depends_on})
+            self.__stale.discard(name)
+            self.recomputed[name] += 1
+        return self.__values[name]
+
+    def is_stale(self, name):
+        return name in self.__stale
+
+    def __read(self, key):
+        if key in self.__nodes:
+            return self.get(key)
+        return self.__inputs[key]
+
+    def __invalidate(self, key):
+        pending = list(self.__dependents[key])
+        while pending:
+            name = pending.pop()
+            if name not in self.__stale:
+                self.__stale.add(name)
+                pending.extend(self.__dependents[name])
@@ -1,10 +1,12 @@
 class State:
-    _state = {}
-    _initial = {}
-    _previous = {}
-    _is_modified = False
-
     def __init__(self, defaults={}):
+        # Each instance needs its own dictionaries; class-level ones would be
+        # shared by every State in the kernel.
+        self._state = {}
+        self._initial = {}
+        self._previous = {}
+        self._is_modified = False
+        self._version = 0
         self.define(defaults)
 
     def define(self, definition):
@@ -12,6 +14,7 @@ class State:
         self._initial.update(definition)
         self._previous.update(definition)
         self._is_modified = True
+        self._version += 1
         return self.get_all()
 
     def get(self, prop):
@@ -26,13 +29,19 @@ class State:
     def set_multiple(self, updates):
         self._state.update(updates)
         self._is_modified = self._state != self._previous
+        if self._is_modified:
+            self._version += 1
         self._previous.update(self._state)
         return self.get_all()
     
     def reset(self):
         self._state = self._initial.copy()
+        self._version += 1
         return self.get_all()
     
+    def version(self):
+        return self._version
+
     def has_changed(self):
         return self._is_modified
     
@@ -0,0 +1,170 @@
+"""
+Provides what's needed to plot a live, high rate signal: a fixed-size ring
+buffer, min/max decimation down to one pair of points per pixel column, and a
+source that streams generated samples through a local socket, standing in for
+a network feed.
+"""
+
+import socket
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 512  # Samples per socket write.
+
+
+class RingBuffer:
+    """
+    Keeps the last capacity rows of a stream in a preallocated array. Rows
+    are copied in place, so appending never allocates, however high the
+    rate. Reading returns the rows oldest first.
+    """
+
+    def __init__(self, capacity, width=1, dtype=np.float64):
+        self.__data = np.zeros((capacity, width), dtype=dtype)
+        self.__capacity = capacity
+        self.__start = 0
+        self.__size = 0
+        self.__lock = Lock()
+        self.appended = 0
+
+    def __len__(self):
+        return self.__size
+
+    def extend(self, rows):
+        rows = np.asarray(rows).reshape(-1, self.__data.shape[1])
+        if len(rows) > self.__capacity:
+            rows = rows[-self.__capacity :]
+        count = len(rows)
+        with self.__lock:
+            end = (self.__start + self.__size) % self.__capacity
+            first = min(count, self.__capacity - end)
+            self.__data[end : end + first] = rows[:first]
+            self.__data[: count - first] = rows[first:]
+            overflow = max(0, self.__size + count - self.__capacity)
+            self.__start = (self.__start + overflow) % self.__capacity
+            self.__size = min(self.__capacity, self.__size + count)
+            self.appended += count
+
+    def latest(self, count=None):
+        """Returns a copy of the last count rows (all of them by default)."""
+        with self.__lock:
+            count = self.__size if count is None else min(count, self.__size)
+            start = (self.__start + self.__size - count) % self.__capacity
+            end = start + count
+            if end <= self.__capacity:
+                return self.__data[start:end].copy()
+            return np.concatenate(
+                (self.__data[start:], self.__data[: end - self.__capacity])
+            )
+
+
+def min_max_decimate(xs, ys, x_range, columns):
+    """
+    Reduces samples to the lowest and highest y in each of columns equal
+    slices of x_range, so a line through them keeps every peak however many
+    samples there are. Returns (xs, ys), two points per column with samples.
+    """
+    x0, x1 = x_range
+    indices = ((np.asarray(xs) - x0) * (columns / (x1 - x0))).astype(np.intp)
+    inside = (indices >= 0) & (indices < columns)
+    indices = indices[inside]
+    ys = np.asarray(ys)[inside]
+
+    lows = np.full(columns, np.inf)
+    highs = np.full(columns, -np.inf)
+    np.minimum.at(lows, indices, ys)
+    np.maximum.at(highs, indices, ys)
+
+    filled = np.isfinite(lows)
+    centres = x0 + (np.arange(columns) + 0.5) * ((x1 - x0) / columns)
+    return (
+        np.repeat(centres[filled], 2),
+        np.column_stack((lows[filled], highs[filled])).ravel(),
+    )
+
+
+class SocketSignalSource:
+    """
+    Streams rows from a generate function into a RingBuffer through a socket
+    pair. One thread writes the rows at the given rate, as a remote device
+    would; another reads them off the socket into the buffer.
+    """
+
+    def __init__(self, buffer, generate, rate, width=2, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        The generate function takes the index of the first sample and a count,
+        and returns that many rows of width float64 values. The rate is in
+        samples per second.
+        """
+        self.__buffer = buffer
+        self.__generate = generate
+        self.__rate = rate
+        self.__row_bytes = width * np.dtype(np.float64).itemsize
+        self.__width = width
+        self.__chunk_size = chunk_size
+        self.__stopped = Event()
+        self.__threads = []
+        self.__sockets = ()
+        self.sent = 0
+        self.received = 0
+
+    def start(self):
+        self.__stopped.clear()
+        self.__sockets = socket.socketpair()
+        self.__threads = [
+            Thread(target=self.__send, args=(self.__sockets[0],), daemon=True),
+            Thread(target=self.__receive, args=(self.__sockets[1],), daemon=True),
+        ]
+        for thread in self.__threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self.__stopped.set()
+        for s in self.__sockets:
+            try:
+                s.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for thread in self.__threads:
+            thread.join()
+        for s in self.__sockets:
+            s.close()
+        self.__threads = []
+        return self
+
+    def __send(self, connection):
+        interval = self.__chunk_size / self.__rate
+        deadline = monotonic()
+        while not self.__stopped.is_set():
+            rows = self.__generate(self.sent, self.__chunk_size)
+            try:
+                connection.sendall(np.ascontiguousarray(rows, dtype=np.float64))
+            except OSError:
+                return
+            self.sent += len(rows)
+            deadline += interval
+            sleep(max(0, deadline - monotonic()))
+
+    def __receive(self, connection):
+        # Reads land in a preallocated buffer. A read can end part way through
+        # a row, so whole rows are appended and the rest carried over.
+        chunk = bytearray(self.__chunk_size * self.__row_bytes)
+        view = memoryview(chunk)
+        filled = 0
+        while not self.__stopped.is_set():
+            try:
+                count = connection.recv_into(view[filled:])
+            except OSError:
+                return
+            if count == 0:
+                return
+            filled += count
+            whole = filled - filled % self.__row_bytes
+            if whole:
+                rows = np.frombuffer(chunk, dtype=np.float64, count=whole // 8)
+                self.__buffer.extend(rows.reshape(-1, self.__width))
+                self.received += whole // self.__row_bytes
+                view[: filled - whole] = view[whole:filled]
+                filled -= whole
@@ -0,0 +1,45 @@
+"""
+Provides a class that collects widget updates as they arrive and hands them
+over once per animation frame, so dragging a slider doesn't recalculate the
+animation for every event.
+"""
+
+from threading import Lock
+from time import monotonic
+
+DEFAULT_SETTLE_TIME = 0.1
+
+
+class UpdateCoalescer:
+    """
+    Collects rapid-fire updates, such as the events of a slider being dragged,
+    so they can be applied at most once per animation frame. Later values for
+    the same key replace earlier ones.
+    """
+
+    def __init__(self, settle_time=DEFAULT_SETTLE_TIME, clock=monotonic):
+        self._settle_time = settle_time
+        self._clock = clock
+        self._lock = Lock()
+        self._pending = {}
+        self._last_push = None
+        self.pushed = 0
+        self.flushed = 0
+
+    def push(self, updates):
+        with self._lock:
+            self._pending.update(updates)
+            self._last_push = self._clock()
+            self.pushed += 1
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self.flushed += 1
+        return pending
+
+    def is_active(self):
+        """Whether updates are still arriving, e.g. a drag is in progress."""
+        last_push = self._last_push
+        return last_push is not None and self._clock() - last_push < self._settle_time
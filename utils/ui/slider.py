@@ -16,7 +16,7 @@ def _update_label(label, label_precision):
         label.value = f"{value:.{label_precision}f}"
     return fn
 
-def define_slider(options, key='slider', label_precision=0):
+def define_slider(options, key='slider', label_precision=0, continuous_update=False):
     description, value, minimum, maximum, step = itemgetter(
         SliderProp.DESCRIPTION,
         SliderProp.VALUE,
@@ -32,7 +32,7 @@ def define_slider(options, key='slider', label_precision=0):
         step=step,
         orientation='horizontal',
         readout=False,
-        continuous_update=False
+        continuous_update=continuous_update
     )
 
     label = Label(